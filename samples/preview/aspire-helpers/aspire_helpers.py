@@ -0,0 +1,107 @@
+"""Helpers for AppHost scripts that are kept out of the generated client.
+
+``aspire run`` regenerates everything in ``.aspire/modules``, so these helpers live in
+a module of their own. Copy this file next to ``apphost.py`` and import it once
+``.aspire/modules`` is on ``sys.path``:
+
+    sys.path.insert(0, str(Path(__file__).parent / ".aspire/modules"))
+
+    from aspire_app import create_builder
+    from aspire_helpers import string_expr, with_env_map
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import typing
+
+from aspire_app import (
+    AbstractExpressionValue,
+    AbstractResourceWithConnectionString,
+    AbstractResourceWithEnvironment,
+    EndpointReference,
+    EnvironmentCallbackContext,
+    ExternalServiceResource,
+    ParameterResource,
+    ReferenceExpression,
+)
+
+EnvironmentValue = typing.Union[
+    str,
+    ReferenceExpression,
+    EndpointReference,
+    ParameterResource,
+    ExternalServiceResource,
+    AbstractResourceWithConnectionString,
+    AbstractExpressionValue,
+]
+
+TResource = typing.TypeVar("TResource", bound=AbstractResourceWithEnvironment)
+
+# Matches a single `{name}` placeholder in a string_expr template
+_PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+
+def with_env_map(resource: TResource, variables: typing.Mapping[str, EnvironmentValue]) -> TResource:
+    """
+    Sets several environment variables on a resource with a single AppHost call.
+
+    Each `with_env()` call is a round trip while the model is being built. This registers
+    one environment callback for all of the variables instead, so building the model costs
+    one round trip per resource however many variables it gets. The AppHost runs the
+    callback when it builds the resource's environment, and the callback sets the variables
+    there one at a time, because they all write to the same environment. ExternalServiceResource
+    values can't be set from a callback, so they are set with `with_env()`.
+
+    Returns `resource`, like the fluent methods.
+
+    Example:
+        ```python
+        with_env_map(api, {
+            "LOG_LEVEL": "debug",
+            "REDIS_URL": string_expr("redis://{endpoint}", endpoint=cache.get_endpoint("tcp")),
+        })
+        ```
+    """
+    deferred: dict[str, EnvironmentValue] = {}
+    for name, value in variables.items():
+        if isinstance(value, ExternalServiceResource):
+            resource.with_env(name, value)
+        else:
+            deferred[name] = value
+    if not deferred:
+        return resource
+
+    def set_variables(context: EnvironmentCallbackContext) -> None:
+        env = context.env
+        for name, value in deferred.items():
+            env.set(name, value)
+
+    resource.with_env_callback(set_variables)
+    return resource
+
+
+def string_expr(value: str, **kwargs: typing.Any) -> ReferenceExpression:
+    """
+    Same as `aspire_app.string_expr`, but each template is only parsed once.
+
+    The generated helper rescans the template with `str.replace` once per keyword. This
+    numbers the placeholders in a single pass and caches the result, so a template shared
+    by many resources costs one parse.
+    """
+    format_str, names = _compile_template(value, tuple(kwargs))
+    return ReferenceExpression.format_string(format_str, *(kwargs[name] for name in names))
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_template(value: str, names: tuple[str, ...]) -> tuple[str, tuple[str, ...]]:
+    """The template with numbered placeholders, and the names used, in value provider order."""
+    used = tuple(name for name in names if f"{{{name}}}" in value)
+    indexes = {name: index for index, name in enumerate(used)}
+
+    def number(match: re.Match[str]) -> str:
+        index = indexes.get(match.group(1))
+        return match.group(0) if index is None else f"{{{index}}}"
+
+    return _PLACEHOLDER_PATTERN.sub(number, value), used
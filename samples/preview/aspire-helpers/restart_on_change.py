@@ -0,0 +1,129 @@
+"""Restart ``aspire run`` whenever the AppHost script is saved.
+
+The AppHost can't change the resource graph of an application that is already running,
+so picking up an edit to ``apphost.py`` means stopping the application and running it
+again. This does that from the outside: it runs ``aspire run`` as a child process, and
+when one of the watched files changes it stops the child the way Ctrl+C would and starts
+a new one. The AppHost script itself needs no changes.
+
+    python restart_on_change.py                      # runs `aspire run`, watches apphost.py
+    python restart_on_change.py --watch src -- aspire run --debug
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import typing
+
+_DEFAULT_COMMAND = ["aspire", "run"]
+
+
+def snapshot(paths: typing.Iterable[str]) -> dict[str, float]:
+    """The modification time of every file under `paths`, by path. Missing paths are skipped."""
+    mtimes: dict[str, float] = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = [name for name in dirs if not name.startswith(".") and name != "__pycache__"]
+                for name in files:
+                    _stat_into(mtimes, os.path.join(root, name))
+        else:
+            _stat_into(mtimes, path)
+    return mtimes
+
+
+def _stat_into(mtimes: dict[str, float], path: str) -> None:
+    try:
+        mtimes[path] = os.stat(path).st_mtime
+    except OSError:
+        pass
+
+
+def start(command: typing.Sequence[str]) -> subprocess.Popen[bytes]:
+    """Start `command` in a process group of its own, so that it can be interrupted without interrupting this process."""
+    if sys.platform == "win32":
+        return subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(command, start_new_session=True)
+
+
+def stop(process: subprocess.Popen[bytes], timeout: float) -> None:
+    """
+    Interrupt `process` and wait for it to exit, killing it if it is still running after
+    `timeout` seconds. The interrupt is Ctrl+C (Ctrl+Break on Windows) sent to the whole
+    process group, so `aspire run` shuts its resources down as it would in a terminal.
+    """
+    if process.poll() is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(process.pid, signal.SIGINT)
+    except (OSError, ValueError):
+        pass
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def restart_on_change(
+    command: typing.Sequence[str],
+    paths: typing.Sequence[str],
+    *,
+    interval: float = 1.0,
+    stop_timeout: float = 30.0,
+) -> int:
+    """
+    Run `command`, and stop and restart it whenever a file under `paths` changes.
+
+    Returns the exit code of `command` once it exits on its own. Saves that happen while
+    the command is restarting are picked up by the next check.
+    """
+    last = snapshot(paths)
+    process = start(command)
+    try:
+        while True:
+            time.sleep(interval)
+            code = process.poll()
+            if code is not None:
+                return code
+            current = snapshot(paths)
+            if current == last:
+                continue
+            last = current
+            print("restart_on_change: files changed, restarting", file=sys.stderr, flush=True)
+            stop(process, stop_timeout)
+            process = start(command)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        stop(process, stop_timeout)
+
+
+def main(argv: typing.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Restart `aspire run` when the AppHost script changes.")
+    parser.add_argument("--watch", action="append", metavar="PATH",
+                        help="File or directory to watch; can be repeated (default: apphost.py)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between checks (default: 1)")
+    parser.add_argument("--stop-timeout", type=float, default=30.0,
+                        help="Seconds to wait for the application to stop before killing it (default: 30)")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command to run, after '--' (default: aspire run)")
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    return restart_on_change(
+        command or _DEFAULT_COMMAND,
+        args.watch or ["apphost.py"],
+        interval=args.interval,
+        stop_timeout=args.stop_timeout,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
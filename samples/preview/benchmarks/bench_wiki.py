@@ -0,0 +1,151 @@
+"""Throughput benchmark for the flask-markdown-wiki sample.
+
+Loads the wiki's ``main.py`` against a temporary database seeded with pages, then
+drives ``/page/<slug>`` from reader threads while writer threads save edits. Requests
+go through the Flask test client, so no server or Redis is needed. Pages are
+served from the wiki's in-process cache until a writer saves them. Requires the
+wiki's ``src/requirements.txt``.
+
+    python bench_wiki.py --readers 8 --writers 2 --duration 5
+    python bench_wiki.py --app /path/to/other/main.py
+
+``--per-request`` instead times single requests to ``/`` and ``/page/<slug>`` on one
+thread. Pages are served from the warm cache, so the numbers show the CPU cost of
+routing and template rendering per request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import statistics
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import typing
+from pathlib import Path
+
+DEFAULT_APP = Path(__file__).resolve().parent.parent / "flask-markdown-wiki" / "src" / "main.py"
+
+
+def load_wiki(app_path: str | Path, db_path: str) -> typing.Any:
+    """Import the wiki's ``main.py`` as a module using the database at `db_path`."""
+    spec = importlib.util.spec_from_file_location("wiki_main", app_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.DB_PATH = db_path
+    module.init_db()
+    return module
+
+
+def seed(db_path: str, pages: int) -> None:
+    """Insert `pages` pages of a few KB of Markdown each."""
+    body = "\n\n".join(f"## Section {n}\n\nSome *markdown* text with a [link](/page/home) and `code`." for n in range(40))
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT OR IGNORE INTO pages (slug, title, content) VALUES (?, ?, ?)",
+        ((f"page-{n}", f"Page {n}", body) for n in range(pages)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(wiki: typing.Any, *, readers: int, writers: int, pages: int, duration: float) -> dict[str, typing.Any]:
+    """Read and write pages concurrently for `duration` seconds and collect the results."""
+    stop = threading.Event()
+    latencies: list[float] = []
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader(index: int) -> None:
+        client = wiki.app.test_client()
+        local, errors, n = [], 0, index
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.get(f"/page/page-{n % pages}")
+            local.append(time.perf_counter() - started)
+            errors += response.status_code != 200
+            n += readers
+        with lock:
+            latencies.extend(local)
+            counts["reads"] += len(local)
+            counts["errors"] += errors
+
+    def writer(index: int) -> None:
+        client = wiki.app.test_client()
+        writes, errors, n = 0, 0, index
+        while not stop.is_set():
+            response = client.post(f"/page/page-{n % pages}", data={"content": f"# Edit {n}\n\nUpdated text."})
+            writes += 1
+            errors += response.status_code != 302
+            n += writers
+        with lock:
+            counts["writes"] += writes
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "reads_per_s": counts["reads"] / duration,
+        "writes_per_s": counts["writes"] / duration,
+        "errors": counts["errors"],
+        "read_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "read_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+def per_request(wiki: typing.Any, *, requests: int) -> dict[str, float]:
+    """Mean wall and CPU microseconds per request for the index and a cached page."""
+    client = wiki.app.test_client()
+    results = {}
+    for path in ("/", "/page/page-0"):
+        client.get(path)  # warm up, filling the page cache
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(requests):
+            client.get(path)
+        results[f"{path} wall_us"] = (time.perf_counter() - wall) / requests * 1e6
+        results[f"{path} cpu_us"] = (time.process_time() - cpu) / requests * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=str(DEFAULT_APP), help="Path to the wiki's main.py")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent writer threads")
+    parser.add_argument("--pages", type=int, default=200, help="Number of pages to seed")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run")
+    parser.add_argument("--per-request", type=int, metavar="N", help="Time N sequential requests per route instead")
+    options = parser.parse_args()
+
+    sys.path.insert(0, str(Path(options.app).resolve().parent))
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = str(Path(directory) / "wiki.db")
+        wiki = load_wiki(options.app, db_path)
+        seed(db_path, options.pages)
+        if hasattr(wiki, "rerender_pages"):
+            wiki.rerender_pages()  # store rendered HTML for the seeded pages
+        if options.per_request:
+            for name, value in per_request(wiki, requests=options.per_request).items():
+                print(f"  {name:<24} {value:9.1f}")
+            return
+        result = run(wiki, readers=options.readers, writers=options.writers, pages=options.pages, duration=options.duration)
+
+    print(f"/page/<slug> with {options.readers} readers and {options.writers} writers over {options.duration:.0f}s:")
+    print(f"  reads   {result['reads_per_s']:9.1f}/s  p50 {result['read_p50_ms']:.2f} ms  p99 {result['read_p99_ms']:.2f} ms")
+    print(f"  writes  {result['writes_per_s']:9.1f}/s")
+    print(f"  errors  {result['errors']:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""In-process fake AppHost server for benchmarking the generated aspire_app client.
+
+The fake speaks the same header-delimited JSON-RPC protocol as the real AppHost
+over one end of a ``socket.socketpair``, while an ``AspireClient`` is attached to
+the other end. Requests are served concurrently with an optional simulated
+latency, so benchmarks measure client overhead and round-trip behaviour without
+needing ``aspire run``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import importlib
+import itertools
+import json
+import socket
+import sys
+import threading
+import time
+import typing
+from pathlib import Path
+
+DEFAULT_MODULES = Path(__file__).resolve().parent.parent / "flask-markdown-wiki" / ".aspire" / "modules"
+
+CONTAINER_TYPE = "Aspire.Hosting/Aspire.Hosting.ApplicationModel.ContainerResource"
+
+Handler = typing.Callable[[str, list[typing.Any]], typing.Any]
+
+_handle_ids = itertools.count(1)
+
+
+def load_aspire_app(modules_dir: str | Path = DEFAULT_MODULES) -> typing.Any:
+    """Import the vendored ``aspire_app`` module from an ``.aspire/modules`` directory."""
+    sys.path.insert(0, str(modules_dir))
+    return importlib.import_module("aspire_app")
+
+
+def benchmark_args(description: str) -> argparse.ArgumentParser:
+    """Argument parser shared by the benchmark scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--modules", default=str(DEFAULT_MODULES), help="Path to the .aspire/modules directory to benchmark")
+    return parser
+
+
+class RpcError(Exception):
+    """Raised by a handler to answer a request with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def default_handler(method: str, params: list[typing.Any]) -> typing.Any:
+    """Answer every capability with a fresh container resource handle."""
+    if method == "ping":
+        return "pong"
+    if method == "authenticate":
+        return True
+    if method == "negotiateTransport":
+        # Like the real AppHosts, which don't implement transport negotiation
+        raise RpcError(-32601, f"Method not found: {method}")
+    return {"$handle": str(next(_handle_ids)), "$type": CONTAINER_TYPE}
+
+
+def attachments_handler(method: str, params: list[typing.Any]) -> typing.Any:
+    """
+    `default_handler`, but accepting binary attachment frames. No AppHost supports them
+    yet, so this only exercises the client side of that protocol extension.
+    """
+    if method == "negotiateTransport":
+        return {"binaryAttachments": True}
+    return default_handler(method, params)
+
+
+class FakeAppHost:
+    """A fake AppHost attached to a connected ``AspireClient``."""
+
+    def __init__(self, aspire_app: typing.Any, *, latency: float = 0.0, handler: Handler = default_handler, workers: int = 64) -> None:
+        self._server, client_socket = socket.socketpair()
+        self._latency = latency
+        self._handler = handler
+        self._write_lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._callback_id = 0
+        self._callback_responses: dict[int, tuple[threading.Event, list[typing.Any]]] = {}
+        self.requests = 0
+        # The binary attachments sent with the latest request
+        self.blobs: dict[str, bytes] = {}
+
+        self.client = aspire_app.AspireClient("fake-apphost")
+        self.client._socket = client_socket
+        self.client._connected = True
+        self.client._receive_thread = threading.Thread(target=self.client._receive_loop, daemon=True)
+        self.client._receive_thread.start()
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> FakeAppHost:
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Disconnect the client and stop the server thread and its workers."""
+        # Mark the client disconnected first, so that it does not treat the hang-up as an error
+        self.client._close_connection()
+        # Closing a socket does not wake a thread blocked reading it; shutting it down does, on both ends
+        self._server.shutdown(socket.SHUT_RDWR)
+        self._server.close()
+        self._thread.join()
+        self.client.disconnect()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def send(self, message: dict[str, typing.Any]) -> None:
+        """Send a JSON-RPC message (response or server request) to the client."""
+        body = json.dumps(message).encode("utf-8")
+        with self._write_lock:
+            self._server.sendall(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+    def invoke_callback(self, callback_id: str, *args: typing.Any) -> typing.Any:
+        """Invoke a registered client callback the way the AppHost does and wait for its result."""
+        with self._write_lock:
+            self._callback_id += 1
+            request_id = self._callback_id
+        event, slot = threading.Event(), []
+        self._callback_responses[request_id] = (event, slot)
+        params = {f"p{index}": arg for index, arg in enumerate(args)}
+        self.send({"jsonrpc": "2.0", "id": request_id, "method": "invokeCallback", "params": [callback_id, params]})
+        event.wait()
+        del self._callback_responses[request_id]
+        return slot[0]
+
+    def _frames(self) -> typing.Iterator[dict[str, typing.Any]]:
+        buffer = b""
+        blobs: dict[str, bytes] = {}
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = self._server.recv(1 << 16)
+                if not chunk:
+                    return
+                buffer += chunk
+            header, buffer = buffer.split(b"\r\n\r\n", 1)
+            headers = dict(line.split(b": ", 1) for line in header.split(b"\r\n"))
+            length = int(headers[b"Content-Length"])
+            while len(buffer) < length:
+                chunk = self._server.recv(1 << 16)
+                if not chunk:
+                    return
+                buffer += chunk
+            body, buffer = buffer[:length], buffer[length:]
+            if b"Aspire-Blob-Id" in headers:
+                # Binary attachments arrive ahead of the request that references them
+                blobs[headers[b"Aspire-Blob-Id"].decode()] = body
+                continue
+            if blobs:
+                self.blobs, blobs = blobs, {}
+            yield json.loads(body)
+
+    def _serve(self) -> None:
+        try:
+            for message in self._frames():
+                if "method" in message:
+                    self.requests += 1
+                    self._executor.submit(self._respond, message)
+                elif message.get("id") in self._callback_responses:
+                    event, slot = self._callback_responses[message["id"]]
+                    slot.append(message.get("result", message.get("error")))
+                    event.set()
+        except OSError:
+            pass
+
+    def _respond(self, message: dict[str, typing.Any]) -> None:
+        if self._latency:
+            time.sleep(self._latency)
+        try:
+            response = {"result": self._handler(message["method"], message.get("params", []))}
+        except RpcError as e:
+            response = {"error": {"code": e.code, "message": str(e)}}
+        try:
+            self.send({"jsonrpc": "2.0", "id": message["id"], **response})
+        except OSError:
+            pass
@@ -0,0 +1,340 @@
+"""Benchmark suite for the hot paths of the generated aspire_app client.
+
+Every benchmark runs the real client code, either directly or against the
+in-process fake AppHost, and reports the median and fastest time per operation. Results
+are written as JSON so that a new copy of the generated SDK can be compared
+against a stored baseline before it is vendored into ``.aspire/modules``:
+
+    python run_benchmarks.py --save results/baseline.json
+    python run_benchmarks.py --modules ../django-htmx-polls/.aspire/modules --compare results/baseline.json
+
+``--compare`` exits with status 1 when any benchmark is slower than the
+baseline by more than ``--threshold`` (default 25%) plus the run-to-run noise
+measured for it. Each sample is paired with a sample of a fixed pure-Python
+workload, and benchmarks are compared relative to it, so a machine that is
+slower than when the baseline was recorded, or slows down during the run, does
+not fail the comparison. Benchmarks that look slower are measured again
+(``--retries``) before they are reported. The machine and Python build are saved
+with the results; ``--compare`` warns when they differ.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import typing
+from pathlib import Path
+
+from fake_apphost import CONTAINER_TYPE, FakeAppHost, attachments_handler, benchmark_args, load_aspire_app
+
+Benchmark = typing.Callable[[typing.Any, contextlib.ExitStack], typing.Callable[[], typing.Any]]
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+# name -> (setup returning the timed callable, operations per call). Setups register
+# anything that needs tearing down, such as a FakeAppHost, on the exit stack they are given.
+BENCHMARKS: dict[str, tuple[Benchmark, int]] = {}
+
+
+def benchmark(name: str, *, operations: int = 1) -> typing.Callable[[Benchmark], Benchmark]:
+    """Register a benchmark. The decorated function performs setup and returns the timed callable."""
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (setup, operations)
+        return setup
+    return register
+
+
+class _BufferSocket:
+    """A socket stand-in that serves reads from an in-memory buffer."""
+
+    def __init__(self, data: bytes) -> None:
+        self._stream = io.BytesIO(data)
+
+    def recv(self, n: int) -> bytes:
+        return self._stream.read(n)
+
+
+def _frame(message: dict[str, typing.Any]) -> bytes:
+    body = json.dumps(message).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def _handle(aspire_app: typing.Any, handle_id: str = "1") -> typing.Any:
+    return aspire_app.Handle({"$handle": handle_id, "$type": CONTAINER_TYPE})
+
+
+@benchmark("frame_parsing", operations=100)
+def bench_frame_parsing(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    payload = {"jsonrpc": "2.0", "id": 1, "result": {"$handle": "42", "$type": CONTAINER_TYPE}}
+    data = _frame(payload) * 100
+    client = aspire_app.AspireClient("benchmark")
+
+    def run() -> None:
+        client._socket = _BufferSocket(data)
+        for _ in range(100):
+            headers = client._read_headers()
+            json.loads(client._recv_exactly(int(headers["content-length"])))
+    return run
+
+
+@benchmark("json_encoder", operations=100)
+def bench_json_encoder(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    handle = _handle(aspire_app)
+    expression = aspire_app.string_expr("redis://{host}:{port}", host=handle, port=6379)
+    message = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "invokeCapability",
+        "params": ["Aspire.Hosting/withEnvironment", {"builder": handle, "name": "REDIS_URL", "value": expression, "payload": b"\x00" * 256}],
+    }
+
+    def run() -> None:
+        for _ in range(100):
+            json.dumps(message, cls=aspire_app._AspireJSONEncoder)
+    return run
+
+
+@benchmark("marshal_transport_value", operations=100)
+def bench_marshal_transport_value(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    client = aspire_app.AspireClient("benchmark")
+    handle = _handle(aspire_app)
+    args = {
+        "builder": handle,
+        "args": ["--port", "8080", "--verbose"],
+        "options": {"Args": ["a", "b"], "ProjectDirectory": "/src", "nested": [{"key": "value"}] * 5},
+    }
+
+    def run() -> None:
+        for _ in range(100):
+            client._marshal_transport_value(args)
+    return run
+
+
+@benchmark("wrap_if_handle", operations=100)
+def bench_wrap_if_handle(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    client = aspire_app.AspireClient("benchmark")
+    value = {"$handle": "42", "$type": CONTAINER_TYPE}
+
+    def run() -> None:
+        for _ in range(100):
+            aspire_app._wrap_if_handle(value, client)
+    return run
+
+
+@benchmark("callback_dispatch", operations=50)
+def bench_callback_dispatch(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    apphost = stack.enter_context(FakeAppHost(aspire_app))
+    callback_id = apphost.client.register_callback(lambda context: None)
+    argument = {"$handle": "7", "$type": CONTAINER_TYPE}
+
+    def run() -> None:
+        for _ in range(50):
+            apphost.invoke_callback(callback_id, argument)
+    return run
+
+
+@benchmark("invoke_capability", operations=50)
+def bench_invoke_capability(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    apphost = stack.enter_context(FakeAppHost(aspire_app))
+    resource = aspire_app.ContainerResource(_handle(aspire_app), apphost.client)
+
+    def run() -> None:
+        for _ in range(50):
+            resource.with_env("LOG_LEVEL", "debug")
+    return run
+
+
+@benchmark("apphost_500_resources", operations=500)
+def bench_apphost_500_resources(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    apphost = stack.enter_context(FakeAppHost(aspire_app))
+    builder = aspire_app.DistributedApplicationBuilder(apphost.client, {})
+    builder._handle = _handle(aspire_app, "builder")
+    cache = aspire_app.ContainerResource(_handle(aspire_app, "cache"), apphost.client)
+
+    def run() -> None:
+        for index in range(500):
+            service = builder.add_container(f"service-{index}", "nginx")
+            service.with_env("SERVICE_INDEX", str(index))
+            service.with_env("REDIS_URL", aspire_app.string_expr("redis://{cache}", cache=cache))
+            service.with_http_endpoint(target_port=8080, env="PORT")
+            service.wait_for(cache)
+    return run
+
+
+def _binary_argument(aspire_app: typing.Any, apphost: FakeAppHost) -> typing.Callable[[], typing.Any]:
+    resource = aspire_app.ContainerResource(_handle(aspire_app), apphost.client)
+    payload = bytes(range(256)) * 4096  # 1 MiB
+
+    def run() -> None:
+        for _ in range(10):
+            apphost.client.invoke_capability("Aspire.Hosting/withContainerFile", {"builder": resource.handle, "contents": payload})
+    return run
+
+
+@benchmark("binary_argument", operations=10)
+def bench_binary_argument(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    # The AppHost declines transport negotiation, so bytes go base64-encoded in the JSON body
+    return _binary_argument(aspire_app, stack.enter_context(FakeAppHost(aspire_app)))
+
+
+@benchmark("binary_argument_attachments", operations=10)
+def bench_binary_argument_attachments(aspire_app: typing.Any, stack: contextlib.ExitStack) -> typing.Callable[[], typing.Any]:
+    # Binary attachment frames are a protocol extension that no AppHost accepts yet
+    return _binary_argument(aspire_app, stack.enter_context(FakeAppHost(aspire_app, handler=attachments_handler)))
+
+
+def _sample(run: typing.Callable[[], typing.Any], min_time: float) -> float:
+    """Seconds per call of `run`, looping until at least `min_time` seconds have passed."""
+    loops, elapsed = 0, 0.0
+    started = time.perf_counter()
+    while elapsed < min_time:
+        run()
+        loops += 1
+        elapsed = time.perf_counter() - started
+    return elapsed / loops
+
+
+_CALIBRATION_DOCUMENT = {"items": [{"name": f"item-{index}", "values": list(range(10))} for index in range(50)]}
+
+
+def _calibration() -> None:
+    """A fixed pure-Python workload that does not use aspire_app."""
+    json.loads(json.dumps(_CALIBRATION_DOCUMENT))
+
+
+def run_benchmark(name: str, aspire_app: typing.Any, *, repeat: int, min_time: float) -> dict[str, typing.Any]:
+    """
+    Time one benchmark `repeat` times, in microseconds per operation. Each sample is paired
+    with a sample of the calibration workload taken just before it, and `relative_min` and
+    `relative_median` are the benchmark's time in units of that workload. The machine's speed
+    drifts during a run, but a pair of samples sees the same speed, so comparisons use them.
+    """
+    setup, operations = BENCHMARKS[name]
+    with contextlib.ExitStack() as stack:
+        run = setup(aspire_app, stack)
+        run()  # warm up
+        samples, relative = [], []
+        for _ in range(repeat):
+            calibration = _sample(_calibration, min_time / 4)
+            sample = _sample(run, min_time) / operations
+            samples.append(sample * 1e6)
+            relative.append(sample / calibration)
+    return {
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "samples": len(samples),
+        "relative_min": min(relative),
+        "relative_median": statistics.median(relative),
+    }
+
+
+def environment() -> dict[str, typing.Any]:
+    """The machine and Python build that timings were taken on."""
+    return {
+        "machine": {
+            "platform": platform.platform(),
+            "architecture": platform.machine(),
+            "processor": platform.processor() or None,
+            "cpus": os.cpu_count(),
+        },
+        "python": {
+            "implementation": platform.python_implementation(),
+            "version": platform.python_version(),
+            "compiler": platform.python_compiler(),
+        },
+    }
+
+
+def compare(results: dict[str, typing.Any], baseline: dict[str, typing.Any], threshold: float) -> dict[str, tuple[float, float]]:
+    """
+    The slowdown of each benchmark that is in `baseline`, with the slowdown it is allowed,
+    by name. The slowdown compares the fastest samples relative to the calibration workload.
+    A benchmark is allowed `threshold` plus its noise, the larger of how far the median is
+    above the fastest sample in this run and in the baseline.
+    """
+    checks: dict[str, tuple[float, float]] = {}
+    for name, result in results.items():
+        if name in baseline:
+            # Results saved without calibration are compared in plain microseconds
+            key = "relative" if "relative_min" in baseline[name] else ""
+            fastest, median = (f"{key}_min", f"{key}_median") if key else ("min_us", "median_us")
+            noise = max(result[median] / result[fastest], baseline[name][median] / baseline[name][fastest]) - 1
+            checks[name] = (result[fastest] / baseline[name][fastest], 1 + threshold + noise)
+    return checks
+
+
+def main() -> None:
+    parser = benchmark_args(__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per sample")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a comparison fails, on top of the measured noise")
+    parser.add_argument("--retries", type=int, default=2, help="Times to measure a benchmark again before reporting it as slower")
+    options = parser.parse_args()
+
+    aspire_app = load_aspire_app(options.modules)
+    results: dict[str, typing.Any] = {}
+    print(f"{'benchmark':<28} {'median us/op':>13} {'min us/op':>11} {'relative':>10}")
+    for name in BENCHMARKS:
+        if options.filter not in name:
+            continue
+        results[name] = result = run_benchmark(name, aspire_app, repeat=options.repeat, min_time=options.min_time)
+        print(f"{name:<28} {result['median_us']:13.2f} {result['min_us']:11.2f} {result['relative_min']:10.3f}")
+
+    if options.save:
+        document = {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "aspire_app_version": aspire_app.__version__,
+            # Relative to the repository root, so the file is the same wherever it is checked out
+            "modules": Path(os.path.relpath(Path(options.modules).resolve(), REPO_ROOT)).as_posix(),
+            **environment(),
+            "benchmarks": results,
+        }
+        Path(options.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(options.save).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {options.save}")
+
+    if options.compare:
+        document = json.loads(Path(options.compare).read_text(encoding="utf-8"))
+        current = environment()
+        for key in ("machine", "python"):
+            if document.get(key) != current[key]:
+                print(f"warning: the baseline was recorded with a different {key}: {document.get(key)}", file=sys.stderr)
+        baseline = document["benchmarks"]
+        checks = compare(results, baseline, options.threshold)
+        for _ in range(options.retries):
+            suspects = [name for name, (ratio, allowed) in checks.items() if ratio > allowed]
+            if not suspects:
+                break
+            # A single slow run is usually the machine, not the code; keep the fastest measurement
+            print(f"\nMeasuring again: {', '.join(suspects)}")
+            for name in suspects:
+                result = run_benchmark(name, aspire_app, repeat=options.repeat, min_time=options.min_time)
+                results[name] = min(results[name], result, key=lambda entry: entry["relative_min"])
+            checks = compare(results, baseline, options.threshold)
+
+        print(f"\nCompared with {options.compare} (threshold {options.threshold:.0%} plus noise):")
+        regressed = False
+        for name in results:
+            if name not in checks:
+                print(f"  {name:<28} (new)")
+                continue
+            ratio, allowed = checks[name]
+            status = "REGRESSION" if ratio > allowed else "ok"
+            regressed = regressed or ratio > allowed
+            print(f"  {name:<28} {ratio:6.2f}x  (allowed {allowed:.2f}x)  {status}")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
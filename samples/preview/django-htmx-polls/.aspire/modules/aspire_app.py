@@ -8,20 +8,29 @@
 from __future__ import annotations
 
 import os
+import atexit
 import base64
 import sys
 import json
 import logging
+import queue
 import secrets
 import signal
 import socket
 import threading
 import time
 import abc
+import asyncio
+import concurrent.futures
+import copy
+import itertools
 import datetime
 import types
 import typing
+import weakref
 from functools import cached_property as _cached_property
+from functools import wraps as _wraps
+import contextlib
 from contextlib import AbstractContextManager
 
 _logger = logging.getLogger(__name__)
@@ -33,6 +42,24 @@ _MAX_MESSAGE_SIZE = 64 * 1024 * 1024
 _MAX_HEADER_COUNT = 16
 _MAX_HEADER_BYTES = 8 * 1024
 
+# Binary arguments at least this large are sent as their own frame instead of base64 in the JSON body
+_BINARY_ATTACHMENT_THRESHOLD = 64 * 1024
+
+# Maximum number of buffers handed to a single sendmsg() call (below the usual IOV_MAX of 1024)
+_MAX_SEND_BUFFERS = 512
+
+# Capabilities that block until the application or a resource gets somewhere, so the
+# client-wide request_timeout does not apply to them; a per-call deadline still does.
+_BLOCKING_CAPABILITIES = frozenset({
+    'Aspire.Hosting/run',
+    'Aspire.Hosting/waitForDependencies',
+    'Aspire.Hosting/waitForResourceCompletion',
+    'Aspire.Hosting/waitForResourceHealthy',
+    'Aspire.Hosting/waitForResourceState',
+    'Aspire.Hosting/waitForResourceStates',
+    'Aspire.Hosting/executeResourceCommand',
+})
+
 # Marker string for detecting generic .NET builder type names.
 _BUILDER_GENERIC_MARKER = "Builder`1["
 
@@ -496,9 +523,45 @@ def _datetime_as_isostr(dt: typing.Union[datetime.datetime, datetime.date, datet
         return _timedelta_as_isostr(dt)
 
 
+class _BinaryAttachment:
+    '''
+    A bytes-like argument that travels as its own length-prefixed frame on the socket.
+
+    The JSON body only carries `{"$blob": id, "length": n}`; the payload is written to the
+    socket straight from the caller's buffer, without base64 encoding or copying.
+    '''
+
+    __slots__ = ("id", "payload")
+
+    def __init__(self, attachment_id: str, payload: bytes | bytearray | memoryview) -> None:
+        view = memoryview(payload)
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes())
+        self.id = attachment_id
+        self.payload = view.cast("B")
+
+    def to_json(self) -> dict[str, typing.Any]:
+        return {"$blob": self.id, "length": self.payload.nbytes}
+
+    def __repr__(self) -> str:
+        return f"<{self.id}: {self.payload.nbytes} bytes>"
+
+    def frame_header(self) -> bytes:
+        '''The header that precedes the payload, in the same format as JSON-RPC frames.'''
+        return (
+            f"Content-Length: {self.payload.nbytes}\r\n"
+            "Content-Type: application/octet-stream\r\n"
+            f"Aspire-Blob-Id: {self.id}\r\n\r\n"
+        ).encode("utf-8")
+
+
 class _AspireJSONEncoder(json.JSONEncoder):
     '''A JSON encoder that's capable of serializing datetime objects and bytes.'''
 
+    def __init__(self, *args: typing.Any, attachments: list[_BinaryAttachment] | None = None, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._attachments = attachments
+
     def default(self, o: typing.Any) -> typing.Any:
         '''Override the default method to handle datetime and bytes serialization.
         :param o: The object to serialize.
@@ -512,7 +575,12 @@ class _AspireJSONEncoder(json.JSONEncoder):
             return o.handle.to_json()
         if isinstance(o, Handle):
             return o.to_json()
-        if isinstance(o, (bytes, bytearray)):
+        if isinstance(o, _BinaryAttachment):
+            if self._attachments is None:
+                return base64.b64encode(o.payload).decode()
+            self._attachments.append(o)
+            return o.to_json()
+        if isinstance(o, (bytes, bytearray, memoryview)):
             return base64.b64encode(o).decode()
         try:
             return _datetime_as_isostr(o)
@@ -522,14 +590,39 @@ class _AspireJSONEncoder(json.JSONEncoder):
 
 
 class AspireClient:
-    '''Client for connecting to the Aspire AppHost via socket/named pipe (synchronous with threads).'''
+    '''
+    Client for connecting to the Aspire AppHost via socket/named pipe (synchronous with threads).
+
+    The client is safe for concurrent use: any number of threads may have requests in
+    flight at once, and responses are matched to callers by request ID. Socket writes
+    are serialized by a dedicated write lock so that they never block response delivery.
+
+    Requests wait for their response indefinitely unless a deadline is given, either per
+    call (`invoke_capability(..., deadline=...)`) or for every call (`request_timeout`).
+    The client-wide `request_timeout` does not apply to capabilities that block by design,
+    such as running the application or waiting for a resource to become healthy.
+    A request that misses its deadline raises TimeoutError and its pending entry is
+    discarded, so a late response is dropped rather than leaked.
+    '''
 
     # Default heartbeat interval in seconds
     DEFAULT_HEARTBEAT_INTERVAL = 5.0
 
-    def __init__(self, socket_path: str, *, debug: bool | None = None, heartbeat_interval: float | None = None) -> None:
+    def __init__(
+        self,
+        socket_path: str,
+        *,
+        debug: bool | None = None,
+        heartbeat_interval: float | None = None,
+        profiler: _ApphostProfiler | None = None,
+        request_timeout: float | None = None,
+        tracer: _ApphostTracer | None = None,
+    ) -> None:
         self.socket_path = socket_path
         self.debug = debug if debug is not None else False
+        self.request_timeout = request_timeout
+        self._profiler = profiler
+        self._tracer = tracer
         self._socket: _PipeSocket | None = None
         self._request_id = 0
         self._pending_requests: dict[int, threading.Event] = {}
@@ -544,9 +637,19 @@ class AspireClient:
         self._connected = False
         self._connection_error: ConnectionError | None = None
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self._callback_registry: dict[str, typing.Callable[..., typing.Any]] = {}
         self._callback_id_counter = 0
         self._callback_threads: dict[str, threading.Thread] = {}
+        self._callback_owners: dict[str, str] = {}
+        self._callback_scopes = threading.local()
+        self.pipeline_timings = PipelineTimings()
+        self.resource_events = ResourceEventBus(self)
+        self._transport_features: dict[str, typing.Any] | None = None
+        # Optional capabilities the AppHost answered with CAPABILITY_NOT_FOUND, so their fallbacks are used directly
+        self._missing_capabilities: set[str] = set()
+        self._attachment_ids = itertools.count(1)
+        self._received_blobs: dict[str, bytes] = {}
 
     def on_disconnect(self, callback: typing.Callable[[], None]) -> None:
         '''Register a callback to be called when the connection is lost'''
@@ -571,7 +674,7 @@ class AspireClient:
                 will be notified. If None, this is an intentional disconnect.
 
         This method:
-        - Closes the socket
+        - Closes the socket and drops any unclaimed binary attachments
         - Sets _connected = False
         - Stores the error (if provided and not already set)
         - Signals the heartbeat thread to stop
@@ -588,6 +691,7 @@ class AspireClient:
                 except Exception:
                     pass
                 self._socket = None
+            self._received_blobs.clear()
 
             # Mark as disconnected
             should_notify = self._connected
@@ -610,7 +714,7 @@ class AspireClient:
 
             for event in self._pending_requests.values():
                 event.set()
-            for (cancellation, _ ) in self._cancellation_threads.values():
+            for (cancellation, _ ) in list(self._cancellation_threads.values()):
                 # Threads will exit on their own when they notice disconnection
                 cancellation()
 
@@ -652,13 +756,15 @@ class AspireClient:
 
     def _recv_exactly(self, n: int) -> bytes:
         '''Read exactly n bytes from the socket'''
-        data = b""
-        while len(data) < n:
-            chunk = typing.cast(_PipeSocket, self._socket).recv(n - len(data))
+        chunks: list[bytes] = []
+        remaining = n
+        while remaining:
+            chunk = typing.cast(_PipeSocket, self._socket).recv(remaining)
             if not chunk:
                 raise ConnectionError("Connection closed")
-            data += chunk
-        return data
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
 
     def _read_line(self) -> bytes:
         '''Read a line ending with \\r\\n from the socket'''
@@ -715,8 +821,17 @@ class AspireClient:
 
                 # Read message content
                 message_bytes = self._recv_exactly(content_length)
+                blob_id = headers.get("aspire-blob-id")
+                if blob_id is not None:
+                    # A binary attachment for the next message that references it
+                    self._received_blobs[blob_id] = message_bytes
+                    continue
                 message_str = message_bytes.decode("utf-8")
                 message = json.loads(message_str)
+                if self._received_blobs:
+                    message = self._resolve_blobs(message)
+                    # Attachments belong to the message that follows them, so any left over are orphans
+                    self._received_blobs.clear()
                 if self.debug:
                     if message.get("result") == "pong":
                         _logger.debug("<- %s", message)
@@ -746,6 +861,17 @@ class AspireClient:
         except Exception as e:
             self._close_connection(ConnectionError(f"Receive loop error: {e}"))
 
+    def _resolve_blobs(self, value: typing.Any) -> typing.Any:
+        '''Replace `{"$blob": id}` references in a received message with the attachment payloads.'''
+        if isinstance(value, dict):
+            blob_id = value.get("$blob")
+            if isinstance(blob_id, str) and blob_id in self._received_blobs:
+                return self._received_blobs.pop(blob_id)
+            return {key: self._resolve_blobs(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve_blobs(item) for item in value]
+        return value
+
     def _heartbeat_loop(self) -> None:
         '''Periodically ping the server to check connection health.'''
         while not self._heartbeat_stop_event.wait(timeout=self._heartbeat_interval):
@@ -768,12 +894,13 @@ class AspireClient:
             _logger.debug("Invoking callback with params: %s", params)
             callback_id = str(params[0]) if len(params) > 0 else None
             args = params[1] if len(params) > 1 else None
+            trace_context = params[2] if len(params) > 2 else None
 
             # Spawn a separate thread to handle the callback so receive_loop isn't blocked
             thread_id = f"cb_thread_{request_id}_{callback_id}"
             thread = threading.Thread(
                 target=self._execute_callback_thread,
-                args=(callback_id, args, request_id, thread_id),
+                args=(callback_id, args, request_id, thread_id, trace_context),
                 daemon=True
             )
             with self._lock:
@@ -785,7 +912,8 @@ class AspireClient:
         callback_id: str | None,
         args: typing.Any,
         request_id: int | None,
-        thread_id: str
+        thread_id: str,
+        trace_context: dict[str, str] | None = None,
     ) -> None:
         '''Execute a callback in a separate thread and send the response.'''
         result = None
@@ -796,7 +924,12 @@ class AspireClient:
                     callback = self._callback_registry.get(callback_id) if callback_id else None
 
                 if callback:
-                    result = callback(args, self)
+                    if self._tracer is not None and trace_context:
+                        # Continue the AppHost's trace in this callback
+                        with self._tracer.remote_context(trace_context):
+                            result = callback(args, self)
+                    else:
+                        result = callback(args, self)
                     _logger.debug("Callback result: %s", result)
                 else:
                     error = {"code": -32601, "message": f"Callback not found: {callback_id}"}
@@ -853,15 +986,67 @@ class AspireClient:
                 _logger.debug("-> %s", message)
             else:
                 _logger.info("-> %s", message)
-        message_str = json.dumps(message, cls=_AspireJSONEncoder)
+        self._write_frames(self._encode_message(message))
+
+    def _encode_message(self, message: dict[str, typing.Any], attachments: list[_BinaryAttachment] | None = None) -> bytes:
+        '''
+        Encode a JSON-RPC message as a header-delimited frame.
+
+        Binary attachments referenced by the message are appended to `attachments` when it is
+        given, and must be written ahead of the frame; otherwise they are inlined as base64.
+        '''
+        message_str = json.dumps(message, cls=_AspireJSONEncoder, attachments=attachments)
         message_bytes = message_str.encode("utf-8")
         content_length = len(message_bytes)
 
         # Send with HTTP-style headers (HeaderDelimitedMessageHandler format)
         header = f"Content-Length: {content_length}\r\n\r\n"
         header_bytes = header.encode("utf-8")
-        with self._lock:
-            typing.cast(_PipeSocket, self._socket).sendall(header_bytes + message_bytes)
+        return header_bytes + message_bytes
+
+    def _write_frames(self, *parts: bytes | memoryview) -> None:
+        '''
+        Write one or more encoded frames to the socket in a single call.
+
+        When there are several parts they are handed to the socket as they are, with one
+        gather write (sendmsg) where the socket supports it, so large binary attachments
+        are never copied into a joined buffer.
+        '''
+        with self._write_lock:
+            sock = typing.cast(_PipeSocket, self._socket)
+            sendmsg = getattr(sock, "sendmsg", None)
+            if len(parts) == 1 or sendmsg is None:
+                for part in parts:
+                    sock.sendall(part)
+                return
+            buffers = [memoryview(part) for part in parts]
+            while buffers:
+                sent = sendmsg(buffers[:_MAX_SEND_BUFFERS])
+                # Drop what was written, keeping the unsent tail of a partially written buffer
+                while sent:
+                    if sent >= buffers[0].nbytes:
+                        sent -= buffers.pop(0).nbytes
+                    else:
+                        buffers[0] = buffers[0][sent:]
+                        sent = 0
+
+    def _supports_transport_feature(self, name: str) -> bool:
+        '''
+        Ask the AppHost once which optional transport features it accepts: binary
+        attachment frames ("binaryAttachments") and W3C trace context ("traceContext").
+        No AppHost implements negotiateTransport yet, so against current AppHosts both
+        stay off: bytes are sent base64-encoded in the JSON body and no trace context
+        is attached.
+        '''
+        if self._transport_features is None:
+            try:
+                features = self._send_request("negotiateTransport", {"binaryAttachments": True, "traceContext": True})
+            except Exception as e:
+                # AppHosts without optional features reject the method; keep the base protocol
+                _logger.debug("Transport negotiation unavailable: %s", e)
+                features = None
+            self._transport_features = features if isinstance(features, dict) else {}
+        return self._transport_features.get(name) is True
 
     def _check_connection(self) -> None:
         '''Check if connected and raise stored connection error if present.'''
@@ -885,17 +1070,173 @@ class AspireClient:
         self,
         capability_id: str,
         args: dict[str, typing.Any] | None = None,
-        kwargs: typing.Mapping[str, typing.Any] | None = None
+        kwargs: typing.Mapping[str, typing.Any] | None = None,
+        *,
+        deadline: float | None = None,
     ) -> typing.Any:
         '''
         Invoke an ATS capability by ID.
 
         Capabilities are operations exposed by [AspireExport] attributes.
         Results are automatically wrapped in Handle objects when applicable.
+
+        `deadline` is the number of seconds to wait for the response, defaulting to the
+        client's `request_timeout` unless the capability blocks by design. When it passes,
+        TimeoutError is raised and any cancellation token in `args` is cancelled so the
+        AppHost abandons the work too.
         '''
         self._check_connection()
-        result = self._send_request("invokeCapability", capability_id, self._marshal_transport_value(args or {}))
+        expires_at = self._expires_at(deadline, (capability_id,))
+        transport_args = self._marshal_transport_value(args or {})
+        if self._profiler is None and self._tracer is None:
+            result = self._send_request_with_deadline(capability_id, transport_args, expires_at)
+        else:
+            result = self._send_instrumented(capability_id, transport_args, expires_at)
+        result = self._unwrap_capability_result(result, kwargs)
+        callback_ids = [value for value in transport_args.values() if isinstance(value, str) and value.startswith("callback_")]
+        if callback_ids:
+            # Tie callbacks to what owns them: the subscription they created, or the builder they configure
+            owner = result if isinstance(result, DistributedApplicationEventSubscription) else transport_args.get('builder')
+            if owner is not None:
+                self.bind_callbacks(owner, callback_ids)
+        return result
 
+    def invoke_capabilities(
+        self,
+        calls: typing.Iterable[tuple[str, dict[str, typing.Any] | None]],
+        *,
+        deadline: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[typing.Any]:
+        '''
+        Invoke several ATS capabilities as one pipelined batch.
+
+        All requests are framed and written to the socket together and the responses
+        are awaited as a group, so N independent calls cost a single round trip.
+        Results are returned in call order. If any call fails, the first error is
+        raised once every response has been received, unless `return_exceptions` is
+        set, in which case each failed call's exception is returned in its place.
+        `deadline` bounds the whole batch, as for `invoke_capability`.
+        '''
+        self._check_connection()
+        requests = [
+            ("invokeCapability", (capability_id, self._marshal_transport_value(args or {})))
+            for capability_id, args in calls
+        ]
+        if not requests:
+            return []
+        expires_at = self._expires_at(deadline, [params[0] for _, params in requests])
+        if self._profiler is None and self._tracer is None:
+            results = self._send_requests(requests, expires_at=expires_at, return_exceptions=return_exceptions)
+        else:
+            results = self._send_batch_instrumented(requests, expires_at, return_exceptions)
+        if not return_exceptions:
+            return [self._unwrap_capability_result(result) for result in results]
+        unwrapped: list[typing.Any] = []
+        for result in results:
+            try:
+                unwrapped.append(result if isinstance(result, Exception) else self._unwrap_capability_result(result))
+            except Exception as e:
+                unwrapped.append(e)
+        return unwrapped
+
+    def _invoke_if_supported(self, capability_id: str, args: dict[str, typing.Any] | None = None) -> tuple[bool, typing.Any]:
+        '''
+        Invoke a capability that only some AppHosts export. Returns (False, None) if the
+        AppHost answers CAPABILITY_NOT_FOUND, and remembers that, so later calls go straight
+        to the caller's fallback without a round trip.
+        '''
+        if capability_id in self._missing_capabilities:
+            return False, None
+        try:
+            return True, self.invoke_capability(capability_id, args)
+        except AspireError as e:
+            if e.code != AtsErrorCodes.CAPABILITY_NOT_FOUND:
+                raise
+            _logger.debug("%s is not available; using the fallback", capability_id)
+            self._missing_capabilities.add(capability_id)
+            return False, None
+
+    def _invoke_in_order(self, calls: typing.Iterable[tuple[str, dict[str, typing.Any] | None]]) -> list[typing.Any]:
+        '''
+        Invoke capabilities one after another, waiting for each response before sending the
+        next. Fallbacks that replay several writes to the same object use this rather than
+        `invoke_capabilities()`: the AppHost does not order pipelined requests, so the calls
+        in a batch may run in any order.
+        '''
+        return [self.invoke_capability(capability_id, args) for capability_id, args in calls]
+
+    def _expires_at(self, deadline: float | None, capability_ids: typing.Iterable[str]) -> float | None:
+        '''
+        Convert a relative deadline to a time.monotonic() value. Without one, the client's
+        request_timeout applies, unless any of the capabilities is a blocking one.
+        '''
+        if deadline is None:
+            if self.request_timeout is None or not _BLOCKING_CAPABILITIES.isdisjoint(capability_ids):
+                return None
+            deadline = self.request_timeout
+        return time.monotonic() + deadline
+
+    def _send_instrumented(self, capability_id: str, args: dict[str, typing.Any], expires_at: float | None) -> typing.Any:
+        '''Send an invokeCapability request under the profiler and/or a tracing span.'''
+        started = time.perf_counter()
+        try:
+            if self._tracer is None:
+                return self._send_request_with_deadline(capability_id, args, expires_at)
+            with self._tracer.capability_span(capability_id, args):
+                trace_context = self._tracer.trace_context() if self._supports_transport_feature("traceContext") else None
+                return self._send_request_with_deadline(capability_id, args, expires_at, trace_context)
+        finally:
+            if self._profiler is not None:
+                self._profiler.record_capability(capability_id, started)
+
+    def _send_batch_instrumented(
+        self,
+        requests: list[tuple[str, tuple[typing.Any, ...]]],
+        expires_at: float | None,
+        return_exceptions: bool,
+    ) -> list[typing.Any]:
+        '''Send a pipelined batch under the profiler and/or one tracing span for the whole batch.'''
+        name = f"{requests[0][1][0]} (batch of {len(requests)})"
+        started = time.perf_counter()
+        try:
+            if self._tracer is None:
+                return self._send_requests(requests, expires_at=expires_at, return_exceptions=return_exceptions)
+            with self._tracer.capability_span(requests[0][1][0], requests[0][1][1], batch_size=len(requests)):
+                if self._supports_transport_feature("traceContext"):
+                    trace_context = self._tracer.trace_context()
+                    requests = [(method, (*params, trace_context)) for method, params in requests]
+                return self._send_requests(requests, expires_at=expires_at, return_exceptions=return_exceptions)
+        finally:
+            if self._profiler is not None:
+                self._profiler.record_capability(name, started)
+
+    def _send_request_with_deadline(
+        self,
+        capability_id: str,
+        args: dict[str, typing.Any],
+        expires_at: float | None,
+        trace_context: dict[str, str] | None = None,
+    ) -> typing.Any:
+        '''
+        Send an invokeCapability request. A cancellation token in the arguments is cancelled
+        if the deadline passes, and released once the AppHost has responded. A W3C trace
+        context, if given, is sent as a third parameter.
+        '''
+        params: tuple[typing.Any, ...] = (capability_id, args, trace_context) if trace_context else (capability_id, args)
+        cancellation_id = args.get('cancellationToken')
+        if not isinstance(cancellation_id, str):
+            return self._send_request("invokeCapability", *params, expires_at=expires_at)
+        try:
+            result = self._send_request("invokeCapability", *params, expires_at=expires_at)
+        except TimeoutError:
+            self.cancel_token(cancellation_id)
+            raise
+        self.release_cancellation_token(cancellation_id)
+        return result
+
+    def _unwrap_capability_result(self, result: typing.Any, kwargs: typing.Mapping[str, typing.Any] | None = None) -> typing.Any:
+        '''Raise structured ATS errors and wrap returned handles.'''
         # Check for structured error response
         if _is_ats_error(result):
             if result["$error"].get("code") == AtsErrorCodes.TYPE_MISMATCH:
@@ -906,51 +1247,106 @@ class AspireClient:
         return _wrap_if_handle(result, self, kwargs)
 
     def _marshal_transport_value(self, value: typing.Any) -> typing.Any:
+        if isinstance(value, str):
+            return value
         if callable(value):
             return self.register_callback(value)
         if isinstance(value, dict):
             return {key: self._marshal_transport_value(nested_value) for key, nested_value in value.items()}
         if isinstance(value, (list, tuple)):
             return [self._marshal_transport_value(item) for item in value]
+        if (
+            isinstance(value, (bytes, bytearray, memoryview))
+            and memoryview(value).nbytes >= _BINARY_ATTACHMENT_THRESHOLD
+            and self._supports_transport_feature("binaryAttachments")
+        ):
+            return _BinaryAttachment(f"blob_{next(self._attachment_ids)}", value)
         return value
 
-    def _send_request(self, method: str, *params: typing.Any) -> typing.Any:
+    def _send_request(self, method: str, *params: typing.Any, expires_at: float | None = None) -> typing.Any:
         '''Send a JSON-RPC request and wait for response'''
-        with self._lock:
-            self._request_id += 1
-            request_id = self._request_id
-
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": list(params) if params else []
-        }
-        # Create event for response
-        event = threading.Event()
-        with self._lock:
-            self._pending_requests[request_id] = event
+        return self._send_requests([(method, params)], expires_at=expires_at)[0]
 
-        # Send request
-        self._send_message(request)
+    def _send_requests(
+        self,
+        requests: typing.Sequence[tuple[str, typing.Sequence[typing.Any]]],
+        *,
+        expires_at: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[typing.Any]:
+        '''Send JSON-RPC requests in one write and wait for all of their responses'''
+        # Create an event for each response
+        pending: list[tuple[int, threading.Event]] = []
+        with self._lock:
+            for _ in requests:
+                self._request_id += 1
+                event = threading.Event()
+                self._pending_requests[self._request_id] = event
+                pending.append((self._request_id, event))
+
+        frames = []
+        attachments: list[_BinaryAttachment] = []
+        for (request_id, _), (method, params) in zip(pending, requests):
+            request = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": list(params) if params else []
+            }
+            if self.debug:
+                if method == "ping":
+                    _logger.debug("-> %s", request)
+                else:
+                    _logger.info("-> %s", request)
+            frames.append(self._encode_message(request, attachments))
 
-        # Wait for response
-        event.wait()
+        if self._tracer is not None:
+            self._tracer.record_request_size(sum(map(len, frames)) + sum(attachment.payload.nbytes for attachment in attachments))
 
-        # Get result
-        with self._lock:
-            if request_id not in self._pending_results:
-                # Request was cancelled/interrupted
-                if self._connection_error:
-                    raise self._connection_error
-                raise RuntimeError("Request was cancelled")
-            del self._pending_requests[request_id]
-            result, error = self._pending_results.pop(request_id)
+        try:
+            # Send requests, preceded by the binary attachments they reference
+            if attachments:
+                self._write_frames(*[part for attachment in attachments for part in (attachment.frame_header(), attachment.payload)], b"".join(frames))
+            else:
+                self._write_frames(b"".join(frames))
+
+            # Wait for responses
+            results: list[typing.Any] = []
+            first_error: Exception | None = None
+            for request_id, event in pending:
+                timeout = max(expires_at - time.monotonic(), 0.0) if expires_at is not None else None
+                if not event.wait(timeout):
+                    method, params = requests[len(results)]
+                    # Name the capability rather than the JSON-RPC method it was sent with
+                    name = params[0] if method == "invokeCapability" else method
+                    raise TimeoutError(f"No response from the AppHost to '{name}' (request {request_id}) before the deadline")
+
+                # Get result
+                with self._lock:
+                    if request_id not in self._pending_results:
+                        # Request was cancelled/interrupted
+                        if self._connection_error:
+                            raise self._connection_error
+                        raise RuntimeError("Request was cancelled")
+                    result, error = self._pending_results.pop(request_id)
+
+                if error and return_exceptions:
+                    result = error
+                elif error and first_error is None:
+                    first_error = error
+                results.append(result)
+        finally:
+            # Drop every entry for this batch, including those abandoned by a timeout or
+            # disconnect, so that late responses are ignored by the receive loop.
+            with self._lock:
+                for request_id, _ in pending:
+                    self._pending_requests.pop(request_id, None)
+                    self._pending_results.pop(request_id, None)
 
-        if error:
-            raise error
+        if first_error:
+            raise first_error
 
-        return result
+        return results
 
     def register_cancellation_token(self, cancellation_timeout: int | None) -> str | None:
         if not cancellation_timeout:
@@ -962,6 +1358,8 @@ class AspireClient:
 
             def cancellation_thread():
                 cancellation_token.wait()
+                if not self._cancellation_threads.pop(cancellation_id, None):
+                    return  # Released after the operation completed
                 self._check_connection()
                 # Send cancellation request to server
                 try:
@@ -984,6 +1382,25 @@ class AspireClient:
 
         return cancellation_id
 
+    def cancel_token(self, cancellation_id: str) -> None:
+        '''Cancel a token created by `register_cancellation_token` now, rather than when its timeout elapses.'''
+        with self._lock:
+            entry = self._cancellation_threads.get(cancellation_id)
+        if entry is not None:
+            entry[0]()
+
+    def release_cancellation_token(self, cancellation_id: str | None) -> None:
+        '''
+        Discard a token whose operation has completed, stopping its timer and thread
+        without sending a cancellation to the AppHost.
+        '''
+        if cancellation_id is None:
+            return
+        with self._lock:
+            entry = self._cancellation_threads.pop(cancellation_id, None)
+        if entry is not None:
+            entry[0]()
+
     def disconnect(self) -> None:
         '''Disconnect from the server'''
         self._close_connection(error=None)  # Intentional disconnect, no error
@@ -1000,17 +1417,25 @@ class AspireClient:
         for thread in callback_threads:
             if thread.is_alive():
                 thread.join(timeout=1.0)
-        for (_, thread) in self._cancellation_threads.values():
+        for (_, thread) in list(self._cancellation_threads.values()):
             if thread.is_alive():
                 thread.join(timeout=1.0)
 
-    def register_callback(self, callback: typing.Callable[..., typing.Any] | None) -> str | None:
+    def register_callback(self, callback: typing.Callable[..., typing.Any] | None, *, weak: bool = False) -> str | None:
         '''
         Register a callback function that can be invoked from the .NET side.
         Returns a callback ID that should be passed to methods accepting callbacks.
 
         .NET passes arguments as an object with positional keys: { p0: value0, p1: value1, ... }
         This function automatically extracts positional parameters and wraps handles.
+
+        With `weak=True` only a weak reference to the callback is kept (a `weakref.WeakMethod`
+        for bound methods), so registering does not keep its object alive. A weak callback
+        whose target has been collected unregisters itself and returns None.
+
+        Callbacks registered inside `callback_scope()` are unregistered when the scope closes.
+        Callbacks passed to a capability are also bound to the builder they configure, or to
+        the event subscription they create, and can be released with `release_callbacks()`.
         '''
         if callback is None:
             return None
@@ -1019,7 +1444,38 @@ class AspireClient:
             self._callback_id_counter += 1
             callback_id = f"callback_{secrets.token_hex(16)}"
 
+        resolve: typing.Callable[[], typing.Callable[..., typing.Any] | None]
+        if weak:
+            resolve = weakref.WeakMethod(callback) if isinstance(callback, types.MethodType) else weakref.ref(callback)
+        else:
+            resolve = lambda target=callback: target
+
+        wrapper = self._make_callback_wrapper(callback_id, resolve)
+        if self._profiler is not None:
+            wrapper = self._profiler.wrap_callback(wrapper)
+        if self._tracer is not None:
+            wrapper = self._tracer.wrap_callback(wrapper, callback)
+
+        with self._lock:
+            self._callback_registry[callback_id] = wrapper
+        scope = getattr(self._callback_scopes, "current", None)
+        if scope is not None:
+            scope.add(callback_id)
+        return callback_id
+
+    def _make_callback_wrapper(
+        self,
+        callback_id: str,
+        resolve: typing.Callable[[], typing.Callable[..., typing.Any] | None],
+    ) -> typing.Callable[[typing.Any, AspireClient], typing.Any]:
+        '''Build the registry entry for a callback. Kept separate so that weak callbacks are not captured.'''
+
         def wrapper(args: typing.Any, client: AspireClient) -> typing.Any:
+            callback = resolve()
+            if callback is None:
+                _logger.debug("Callback %s was garbage collected; unregistering it", callback_id)
+                client.unregister_callback(callback_id)
+                return None
             # .NET sends args as object { p0: value0, p1: value1, ... }
             if isinstance(args, dict):
                 arg_array = []
@@ -1042,9 +1498,84 @@ class AspireClient:
             # Single primitive value (shouldn't happen with current protocol)
             return callback(_wrap_if_handle(args, client))
 
+        return wrapper
+
+    def unregister_callback(self, callback_id: str | None) -> None:
+        '''Remove a registered callback so that it and everything it captures can be released.'''
+        if callback_id is None:
+            return
         with self._lock:
-            self._callback_registry[callback_id] = wrapper
-        return callback_id
+            self._callback_registry.pop(callback_id, None)
+            self._callback_owners.pop(callback_id, None)
+
+    @staticmethod
+    def _owner_key(owner: typing.Any) -> str:
+        if isinstance(owner, str):
+            return owner
+        if isinstance(owner, Handle):
+            return owner.handle_id
+        return owner.handle.handle_id
+
+    def bind_callbacks(self, owner: typing.Any, callback_ids: typing.Iterable[str | None]) -> None:
+        '''
+        Bind registered callbacks to an owner (a handle, wrapper or key) for `release_callbacks()`.
+        A callback keeps the first owner it is bound to, so shared callbacks can be bound up front.
+        '''
+        key = self._owner_key(owner)
+        with self._lock:
+            for callback_id in callback_ids:
+                if callback_id in self._callback_registry:
+                    self._callback_owners.setdefault(callback_id, key)
+
+    def release_callbacks(self, owner: typing.Any) -> int:
+        '''
+        Unregister every callback bound to `owner`, such as a resource that is no longer
+        used or an event subscription that has been removed. Returns how many were released.
+        '''
+        key = self._owner_key(owner)
+        with self._lock:
+            callback_ids = [callback_id for callback_id, owner_key in self._callback_owners.items() if owner_key == key]
+            for callback_id in callback_ids:
+                del self._callback_owners[callback_id]
+                self._callback_registry.pop(callback_id, None)
+        return len(callback_ids)
+
+    @contextlib.contextmanager
+    def callback_scope(self) -> typing.Iterator[set[str]]:
+        '''
+        Unregister every callback registered by this thread inside the block when it exits.
+
+        Only use it for callbacks the AppHost has finished with when the block ends, such as
+        endpoint updates, which run during the `with_endpoint_callback` call itself. A scoped
+        callback must not outlive its registration on the AppHost: callbacks that the AppHost
+        keeps and invokes later, like `with_env_callback` or event handlers on a resource that
+        stays in the model, would fail with "Callback not found" once the block has exited.
+
+        ```python
+        def use_port(endpoint: EndpointUpdateContext) -> None:
+            endpoint.target_port = 8080
+
+        with client.callback_scope():
+            api.with_endpoint_callback("http", use_port)
+        ```
+        '''
+        outer = getattr(self._callback_scopes, "current", None)
+        scope: set[str] = set()
+        self._callback_scopes.current = scope
+        try:
+            yield scope
+        finally:
+            self._callback_scopes.current = outer
+            with self._lock:
+                for callback_id in scope:
+                    self._callback_registry.pop(callback_id, None)
+                    self._callback_owners.pop(callback_id, None)
+
+    @property
+    def callback_count(self) -> int:
+        '''The number of registered callbacks, for watching the registry size in long-running AppHosts.'''
+        with self._lock:
+            return len(self._callback_registry)
 
     @property
     def connected(self) -> bool:
@@ -1052,6 +1583,232 @@ class AspireClient:
         return self._connected
 
 
+# ============================================================================
+# AppHost Profiler
+# ============================================================================
+
+class _ApphostProfiler:
+    '''
+    Attributes wall time spent in capability invocations and callbacks to the
+    AppHost source line, and the builder method, that caused them.
+
+    Enabled with `create_builder(profile=True)` or the ASPIRE_PROFILE environment
+    variable. A report sorted by total time is printed to stderr when the process
+    exits, and a Chrome trace (also readable by speedscope) is written if an output
+    path is configured.
+    '''
+
+    def __init__(self, output_path: str | None = None) -> None:
+        self._output_path = output_path
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._run_reached: float | None = None
+        # (location, method) -> [calls, total seconds, max seconds]
+        self._totals: dict[tuple[str, str], list[typing.Any]] = {}
+        self._trace_events: list[dict[str, typing.Any]] = []
+        atexit.register(self.report)
+
+    @staticmethod
+    def _call_site() -> tuple[str, str]:
+        '''Find the first frame outside this module and the builder method it called.'''
+        frame = sys._getframe(2)
+        method = "<unknown>"
+        while frame is not None and frame.f_code.co_filename == __file__:
+            method = frame.f_code.co_name
+            frame = frame.f_back
+        if frame is None:
+            return "<aspire_app>", method
+        filename = frame.f_code.co_filename.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+        return f"{filename}:{frame.f_lineno}", method
+
+    def _record(self, location: str, method: str, name: str, category: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            entry = self._totals.setdefault((location, method), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+            if self._output_path:
+                self._trace_events.append({
+                    "name": f"{method} ({location})",
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (started - self._origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"capability": name, "location": location},
+                })
+
+    def record_capability(self, capability_id: str, started: float) -> None:
+        '''Record a capability invocation that began at `started` (perf_counter seconds).'''
+        if self._run_reached is None and capability_id == "Aspire.Hosting/run":
+            self._run_reached = started - self._origin
+        location, method = self._call_site()
+        self._record(location, method, capability_id, "capability", started)
+
+    def wrap_callback(self, wrapper: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        '''Time a registered callback and attribute it to the line that registered it.'''
+        location, method = self._call_site()
+
+        def profiled(args: typing.Any, client: AspireClient) -> typing.Any:
+            started = time.perf_counter()
+            try:
+                return wrapper(args, client)
+            finally:
+                self._record(location, f"callback via {method}", method, "callback", started)
+
+        return profiled
+
+    def report(self, stream: typing.TextIO | None = None) -> None:
+        '''Print the profile sorted by total time and write the trace file if configured.'''
+        stream = stream or sys.stderr
+        with self._lock:
+            rows = sorted(self._totals.items(), key=lambda item: item[1][1], reverse=True)
+            trace_events = list(self._trace_events)
+        print("\nAspire AppHost profile (wall time by source line)", file=stream)
+        if self._run_reached is not None:
+            print(f"  reached app.run() after {self._run_reached * 1000:.1f} ms", file=stream)
+        print(f"  {'total ms':>10} {'calls':>6} {'max ms':>9}  location / method", file=stream)
+        for (location, method), (calls, total, longest) in rows:
+            print(f"  {total * 1000:10.1f} {calls:6d} {longest * 1000:9.1f}  {location}  {method}", file=stream)
+        if self._output_path:
+            try:
+                with open(self._output_path, "w", encoding="utf-8") as trace_file:
+                    json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
+                print(f"  trace written to {self._output_path}", file=stream)
+            except OSError as e:
+                _logger.warning("Failed to write profile trace: %s", e)
+
+
+# ============================================================================
+# AppHost Tracing
+# ============================================================================
+
+class _ApphostTracer:
+    '''
+    Emits OpenTelemetry spans for capability invocations and callbacks.
+
+    Enabled with `create_builder(trace=True)` or the ASPIRE_TRACE environment variable,
+    and requires the opentelemetry-api package. Spans go to the global tracer provider.
+    When none is configured and OTEL_EXPORTER_OTLP_ENDPOINT is set, an OTLP exporter is
+    set up (this needs opentelemetry-sdk and opentelemetry-exporter-otlp), so the AppHost
+    is traced next to the services it starts. Everything up to `app.run()` is recorded
+    under a single startup span. The W3C trace context is sent with each request when the
+    AppHost accepts it, so AppHost-side work joins the same trace.
+    '''
+
+    def __init__(self) -> None:
+        from opentelemetry import context, propagate, trace
+
+        self._context = context
+        self._propagate = propagate
+        self._trace = trace
+        self._configure_exporter()
+        self._tracer = trace.get_tracer("aspire_app", __version__)
+        self._startup: typing.Any = self._tracer.start_span(
+            "aspire apphost startup",
+            attributes={"aspire.apphost.path": os.environ.get('ASPIRE_APPHOST_FILEPATH') or sys.argv[0]},
+        )
+        self._startup_context = trace.set_span_in_context(self._startup)
+        atexit.register(self.end_startup)
+
+    @classmethod
+    def create(cls) -> _ApphostTracer | None:
+        '''Create a tracer, or return None with a warning if OpenTelemetry is not installed.'''
+        try:
+            return cls()
+        except ImportError:
+            _logger.warning("AppHost tracing requested but the opentelemetry-api package is not installed")
+            return None
+
+    def _configure_exporter(self) -> None:
+        if not os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            return
+        if not isinstance(self._trace.get_tracer_provider(), self._trace.ProxyTracerProvider):
+            return  # The AppHost script configured its own provider
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            _logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT is set but the OpenTelemetry SDK or OTLP exporter is not installed")
+            return
+        service_name = os.environ.get("OTEL_SERVICE_NAME", "aspire-apphost")
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        self._trace.set_tracer_provider(provider)
+        atexit.register(provider.shutdown)
+
+    def _parent(self) -> typing.Any:
+        '''The startup span's context while startup is in progress and no other span is active.'''
+        if self._startup is not None and not self._trace.get_current_span().get_span_context().is_valid:
+            return self._startup_context
+        return None
+
+    def end_startup(self) -> None:
+        '''End the startup span. Called when `app.run()` is reached, or at exit.'''
+        startup, self._startup = self._startup, None
+        if startup is not None:
+            startup.end()
+
+    def capability_span(self, capability_id: str, args: typing.Mapping[str, typing.Any], *, batch_size: int = 1) -> typing.ContextManager[typing.Any]:
+        '''Start a client span for a capability invocation, current for the duration of the call.'''
+        parent = self._parent()
+        if capability_id == "Aspire.Hosting/run":
+            self.end_startup()
+        attributes: dict[str, typing.Any] = {"rpc.system": "jsonrpc", "rpc.method": capability_id}
+        for value in args.values():
+            if isinstance(value, Handle):
+                attributes["aspire.handle.type"] = value.type_id
+                break
+        if batch_size > 1:
+            attributes["aspire.batch.size"] = batch_size
+        return self._tracer.start_as_current_span(
+            capability_id,
+            context=parent,
+            kind=self._trace.SpanKind.CLIENT,
+            attributes=attributes,
+        )
+
+    def trace_context(self) -> dict[str, str]:
+        '''The W3C trace context (traceparent, tracestate) of the current span.'''
+        carrier: dict[str, str] = {}
+        self._propagate.inject(carrier)
+        return carrier
+
+    def record_request_size(self, size: int) -> None:
+        '''Record the encoded size of the request on the current span.'''
+        span = self._trace.get_current_span()
+        if span.is_recording():
+            span.set_attribute("aspire.request.bytes", size)
+
+    @contextlib.contextmanager
+    def remote_context(self, carrier: typing.Mapping[str, str]) -> typing.Iterator[None]:
+        '''Make the trace context received from the AppHost current.'''
+        token = self._context.attach(self._propagate.extract(carrier))
+        try:
+            yield
+        finally:
+            self._context.detach(token)
+
+    def wrap_callback(self, wrapper: typing.Callable[..., typing.Any], callback: typing.Callable[..., typing.Any]) -> typing.Callable[..., typing.Any]:
+        '''Run a registered callback in a server span named after the callback.'''
+        name = getattr(callback, "__qualname__", type(callback).__name__)
+
+        def traced(args: typing.Any, client: AspireClient) -> typing.Any:
+            with self._tracer.start_as_current_span(
+                f"callback {name}",
+                context=self._parent(),
+                kind=self._trace.SpanKind.SERVER,
+                attributes={"aspire.callback": name},
+            ):
+                return wrapper(args, client)
+
+        return traced
+
+
 # ============================================================================
 # CancellationToken
 # ============================================================================
@@ -1253,6 +2010,200 @@ def conditional_expr(condition: typing.Any, *, match: str, when_true: str | Refe
     return ReferenceExpression.conditional(condition, match=match, when_true=when_true, when_false=when_false)
 
 
+# ============================================================================
+# Parallel Configuration
+# ============================================================================
+
+TResource = typing.TypeVar("TResource")
+TResult = typing.TypeVar("TResult")
+
+
+def apply_parallel(
+    configure: typing.Callable[[TResource], TResult],
+    resources: typing.Iterable[TResource],
+    *,
+    max_workers: int | None = 8,
+) -> list[TResult]:
+    '''
+    Helper function for configuring independent resources concurrently.
+
+    Each resource is passed to `configure` on a worker thread, so the capability
+    round trips of different resources overlap instead of running back to back.
+    Resource wrappers and the client are safe to use from several threads as long
+    as each resource is configured by only one thread at a time.
+
+    Results are returned in the order of `resources`. If any call raises, the first
+    exception is re-raised after all calls have finished.
+
+    Example:
+        ```python
+        services = [builder.add_container(f"svc{i}", "nginx") for i in range(100)]
+
+        def configure(service):
+            service.with_env("LOG_LEVEL", "debug")
+            service.with_reference(cache)
+            service.wait_for(cache)
+
+        apply_parallel(configure, services)
+        ```
+    '''
+    resources = list(resources)
+    if not resources:
+        return []
+    if max_workers is not None and max_workers <= 1:
+        return [configure(resource) for resource in resources]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aspire-configure") as executor:
+        futures = [executor.submit(configure, resource) for resource in resources]
+    return [future.result() for future in futures]
+
+
+# ============================================================================
+# Resource Event Bus
+# ============================================================================
+
+class ResourceEventBus:
+    '''
+    Multiplexes resource lifecycle event subscriptions.
+
+    `on_before_resource_started`, `on_resource_stopped`, `on_initialize_resource` and
+    `on_resource_ready` register their handlers here. The AppHost sees one subscription
+    and one callback per event type, tagged with a key for each resource, and the bus
+    fans every delivered event out to that resource's handlers in registration order.
+
+    Setting `batch_window` (in seconds) before the first subscription to an event type
+    lets the AppHost coalesce the events raised within the window into one callback
+    invocation. Awaited events such as BeforeResourceStarted are then delayed by up to
+    the window, so leave it unset unless handlers are slow to schedule.
+
+    If the AppHost does not support multiplexed subscriptions, each resource falls back
+    to a single subscription per event type that is shared by all of its handlers.
+    '''
+
+    def __init__(self, client: AspireClient) -> None:
+        self._client = client
+        self._lock = threading.Lock()
+        self._handlers: dict[tuple[str, str], list[typing.Callable[[typing.Any], None]]] = {}
+        self._callback_ids: dict[str, str] = {}
+        self._keys = itertools.count(1)
+        self.batch_window: float | None = None
+
+    def subscribe(
+        self,
+        resource: typing.Any,
+        event_type: str,
+        handler: typing.Callable[[typing.Any], None],
+        *,
+        builder: Handle | None = None,
+    ) -> typing.Any:
+        '''
+        Adds a handler for `event_type` (for example 'ResourceReady') events of `resource`.
+        `builder` is the handle to subscribe with, and defaults to the resource's current
+        handle. Returns the builder result of the AppHost subscription, or None if the
+        resource was already subscribed to this event type.
+
+        Handlers are keyed on the resource wrapper, not its handle, which changes with every
+        fluent call. If the AppHost subscription fails, the handlers are removed again.
+        '''
+        key = self._key(resource)
+        with self._lock:
+            subscribed = (event_type, key) in self._handlers
+            self._handlers.setdefault((event_type, key), []).append(handler)
+            if subscribed:
+                return None
+        try:
+            return self._subscribe(builder if builder is not None else resource.handle, event_type, key)
+        except BaseException:
+            # Without a subscription none of the handlers would ever run
+            with self._lock:
+                self._handlers.pop((event_type, key), None)
+            raise
+
+    def unsubscribe(self, resource: typing.Any, event_type: str, handler: typing.Callable[[typing.Any], None]) -> None:
+        '''
+        Removes a handler added with `subscribe()`. The AppHost has no way to end a resource
+        event subscription, so it stays in place and is reused if the resource subscribes
+        to this event type again.
+        '''
+        key = self._key(resource)
+        with self._lock:
+            handlers = self._handlers.get((event_type, key), [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def _key(self, resource: typing.Any) -> str:
+        '''The key that tags events for `resource`, assigned to the wrapper the first time it subscribes.'''
+        with self._lock:
+            key = resource.__dict__.get('_event_key')
+            if key is None:
+                key = resource.__dict__['_event_key'] = f"{type(resource).__name__}-{next(self._keys)}"
+            return key
+
+    def _subscribe(self, builder: Handle, event_type: str, key: str) -> typing.Any:
+        capability_id = 'Aspire.Hosting/subscribeResourceEvents'
+        if capability_id not in self._client._missing_capabilities:
+            rpc_args: dict[str, typing.Any] = {'builder': builder, 'eventType': event_type, 'key': key}
+            rpc_args['callback'] = self._shared_callback(event_type)
+            if self.batch_window:
+                rpc_args['batchWindowMilliseconds'] = int(self.batch_window * 1000)
+            supported, result = self._client._invoke_if_supported(capability_id, rpc_args)
+            if supported:
+                return result
+            with self._lock:
+                callback_ids, self._callback_ids = list(self._callback_ids.values()), {}
+            for callback_id in callback_ids:
+                self._client.unregister_callback(callback_id)
+
+        rpc_args = {'builder': builder}
+        rpc_args['callback'] = self._client.register_callback(lambda event: self._fan_out(event_type, key, event))
+        try:
+            return self._client.invoke_capability(f'Aspire.Hosting/on{event_type}', rpc_args)
+        except BaseException:
+            self._client.unregister_callback(rpc_args['callback'])
+            raise
+
+    def handler_count(self, event_type: str | None = None) -> int:
+        '''The number of registered handlers, optionally for one event type.'''
+        with self._lock:
+            return sum(len(handlers) for (kind, _), handlers in self._handlers.items() if event_type in (None, kind))
+
+    def _shared_callback(self, event_type: str) -> str:
+        with self._lock:
+            callback_id = self._callback_ids.get(event_type)
+        if callback_id is None:
+            callback_id = self._client.register_callback(lambda deliveries: self._deliver(event_type, deliveries))
+            # Shared by every resource, so it must not be released with the first one
+            self._client.bind_callbacks('resource_events', [callback_id])
+            with self._lock:
+                callback_id = self._callback_ids.setdefault(event_type, callback_id)
+        return typing.cast(str, callback_id)
+
+    def _deliver(self, event_type: str, deliveries: ResourceEventDelivery | list[ResourceEventDelivery]) -> None:
+        if isinstance(deliveries, dict):
+            deliveries = [deliveries]
+        first_error: Exception | None = None
+        for delivery in deliveries:
+            try:
+                self._fan_out(event_type, delivery['Key'], _wrap_if_handle(delivery['Event'], self._client))
+            except Exception as e:
+                first_error = first_error or e
+        if first_error:
+            raise first_error
+
+    def _fan_out(self, event_type: str, key: str, event: typing.Any) -> None:
+        '''Runs every handler, then raises the first handler error back to the AppHost.'''
+        with self._lock:
+            handlers = list(self._handlers.get((event_type, key), ()))
+        first_error: Exception | None = None
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                _logger.debug("%s handler failed: %s", event_type, e)
+                first_error = first_error or e
+        if first_error:
+            raise first_error
+
+
 # ============================================================================
 # AspireList[T] - Mutable List Wrapper
 # ============================================================================
@@ -1767,6 +2718,35 @@ class ExecuteCommandResult(typing.TypedDict, total=False):
     Message: str | None
     Data: CommandResultData
 
+class ResourceCommandReport(typing.TypedDict, total=False):
+    CommandName: str
+    Results: dict[str, ExecuteCommandResult]
+    Succeeded: list[str]
+    Failed: list[str]
+    Canceled: list[str]
+    ElapsedSeconds: float
+
+class ResourceEndpointSnapshot(typing.TypedDict, total=False):
+    Name: str
+    Scheme: str
+    Host: str
+    Port: int
+    TargetPort: int
+    Url: str
+    IsAllocated: bool
+
+class ResourceRelationshipSnapshot(typing.TypedDict, total=False):
+    Resource: str
+    Type: str
+
+class ResourceSnapshot(typing.TypedDict, total=False):
+    Resource: AbstractResource
+    Name: str
+    Type: str
+    Annotations: list[dict[str, typing.Any]]
+    Endpoints: list[ResourceEndpointSnapshot]
+    Relationships: list[ResourceRelationshipSnapshot]
+
 class GenerateParameterDefault(typing.TypedDict, total=False):
     MinLength: int
     Lower: bool
@@ -1877,6 +2857,17 @@ class ResourceEventDto(typing.TypedDict, total=False):
     HealthStatus: str | None
     ExitCode: int | None
 
+class PipelineStepInfo(typing.TypedDict, total=False):
+    Name: str
+    Description: str | None
+    DependsOn: list[str]
+    RequiredBy: list[str]
+    Tags: list[str]
+
+class ResourceEventDelivery(typing.TypedDict, total=False):
+    Key: str
+    Event: typing.Any
+
 class ResourceUrlAnnotation(typing.TypedDict, total=False):
     Url: str
     DisplayText: str | None
@@ -1978,12 +2969,18 @@ class AbstractAspireStore:
         return result
 
 
+ConfigurationTree = dict[str, typing.Union[str, None, "ConfigurationTree"]]
+
+
 class AbstractConfiguration:
     """Type class for AbstractConfiguration."""
 
     def __init__(self, handle: Handle, client: AspireClient) -> None:
         self._handle = handle
         self._client = client
+        self._snapshots: dict[str, ConfigurationTree] = {}
+        self._snapshot_lock = threading.Lock()
+        self._change_callback_id: str | None = None
 
     def __repr__(self) -> str:
         return f"AbstractConfiguration(handle={self._handle.handle_id})"
@@ -2042,6 +3039,117 @@ class AbstractConfiguration:
         )
         return result
 
+    def snapshot(self, prefix: str = "", *, refresh: bool = False) -> ConfigurationTree:
+        """
+        Gets the configuration subtree under `prefix` as a nested dict of section values.
+
+        The subtree is fetched in one call and kept locally until the configuration's
+        change token fires, so repeated reads cost no round trips. Keys are nested on
+        ':' as in .NET configuration, and a section that has both a value and children
+        keeps its value under the '' key. Pass `refresh=True` to bypass the local view.
+        """
+        prefix = prefix.strip(':')
+        with self._snapshot_lock:
+            if not refresh and prefix in self._snapshots:
+                return copy.deepcopy(self._snapshots[prefix])
+            watching = self._watch_changes()
+            values: dict[str, str | None] | None = None
+            if 'Aspire.Hosting/getConfigurationSnapshot' not in self._client._missing_capabilities:
+                try:
+                    result = self._client.invoke_capability(
+                        'Aspire.Hosting/getConfigurationSnapshot',
+                        {'configuration': self._handle, 'prefix': prefix},
+                    )
+                    values = typing.cast(dict[str, str | None], result)
+                except AspireError as e:
+                    if e.code != AtsErrorCodes.CAPABILITY_NOT_FOUND:
+                        raise
+                    self._client._missing_capabilities.add('Aspire.Hosting/getConfigurationSnapshot')
+            if values is None:
+                values = self._walk_sections(prefix)
+            tree = _nest_configuration(values, prefix)
+            if watching:
+                self._snapshots[prefix] = tree
+            return copy.deepcopy(tree)
+
+    def _watch_changes(self) -> bool:
+        """Subscribes to the configuration change token once. Returns whether snapshots can be kept."""
+        if self._change_callback_id is not None:
+            return True
+        if 'Aspire.Hosting/onConfigurationChanged' in self._client._missing_capabilities:
+            return False
+
+        def on_change() -> None:
+            with self._snapshot_lock:
+                self._snapshots.clear()
+
+        callback_id = self._client.register_callback(on_change)
+        try:
+            self._client.invoke_capability(
+                'Aspire.Hosting/onConfigurationChanged',
+                {'configuration': self._handle, 'callback': callback_id},
+            )
+        except BaseException as e:
+            # The subscription failed, so the AppHost will never invoke the callback
+            self._client.unregister_callback(callback_id)
+            if not isinstance(e, AspireError) or e.code != AtsErrorCodes.CAPABILITY_NOT_FOUND:
+                raise
+            self._client._missing_capabilities.add('Aspire.Hosting/onConfigurationChanged')
+            return False
+        self._change_callback_id = callback_id
+        return True
+
+    def _walk_sections(self, prefix: str) -> dict[str, str | None]:
+        """Reads a subtree breadth first, pipelining every section of a level into one batch."""
+        values: dict[str, str | None] = {}
+        level: list[typing.Any] = [self._handle]
+        if prefix:
+            section, values[prefix] = self._client.invoke_capabilities([
+                ('Aspire.Hosting/getSection', {'configuration': self._handle, 'key': prefix}),
+                ('Aspire.Hosting/getConfigValue', {'configuration': self._handle, 'key': prefix}),
+            ])
+            level = [section]
+        while level:
+            children_lists = self._client.invoke_capabilities(
+                ('Aspire.Hosting/getChildren', {'configuration': section}) for section in level
+            )
+            level = [child for children in children_lists for child in children]
+            if not level:
+                break
+            details = self._client.invoke_capabilities(
+                (f'Microsoft.Extensions.Configuration/IConfigurationSection.{name}', {'context': section})
+                for section in level
+                for name in ('path', 'value')
+            )
+            for index in range(0, len(details), 2):
+                values[details[index]] = details[index + 1]
+        return values
+
+
+def _nest_configuration(values: typing.Mapping[str, str | None], prefix: str) -> ConfigurationTree:
+    """Nests flat configuration paths ('A:B:C') below `prefix` into dicts."""
+    tree: ConfigurationTree = {}
+    strip = len(prefix) + 1 if prefix else 0
+    for path in sorted(values, key=lambda item: item.count(':')):
+        value = values[path]
+        if prefix and path.lower() == prefix.lower():
+            if value is not None:
+                tree[''] = value
+            continue
+        *parents, leaf = path[strip:].split(':')
+        node = tree
+        for part in parents:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {'': child} if child is not None else {}
+            node = child
+        if isinstance(node.get(leaf), dict):
+            if value is not None:
+                node[leaf][''] = value
+        elif leaf not in node or value is not None:
+            node[leaf] = value
+    return tree
+
 
 class AbstractConfigurationSection:
     """Type class for AbstractConfigurationSection."""
@@ -2252,7 +3360,7 @@ class DistributedApplicationBuilder:
         rpc_args: dict[str, typing.Any] = {'builder': self._handle}
         rpc_args['name'] = name
         rpc_args['contextPath'] = context_path
-        rpc_args['callback'] = self._client.register_callback(callback)
+        rpc_args['callback'] = self._client.register_callback(_apply_dockerfile_builder(callback))
         if stage is not None:
             rpc_args['stage'] = stage
         result = self._client.invoke_capability(
@@ -2498,6 +3606,7 @@ class AbstractDistributedApplicationEventing:
             'Aspire.Hosting.Eventing/IDistributedApplicationEventing.unsubscribe',
             rpc_args
         )
+        self._client.release_callbacks(subscription)
 
 
 class AbstractDistributedApplicationPipeline:
@@ -2528,7 +3637,7 @@ class AbstractDistributedApplicationPipeline:
         """Adds an application-level pipeline step in a TypeScript-friendly shape."""
         rpc_args: dict[str, typing.Any] = {'pipeline': self._handle}
         rpc_args['stepName'] = step_name
-        rpc_args['callback'] = self._client.register_callback(callback)
+        rpc_args['callback'] = self._client.register_callback(self._client.pipeline_timings.wrap(step_name, callback))
         if depends_on is not None:
             rpc_args['dependsOn'] = depends_on
         if required_by is not None:
@@ -3798,6 +4907,7 @@ class DistributedApplicationModel:
     def __init__(self, handle: Handle, client: AspireClient) -> None:
         self._handle = handle
         self._client = client
+        self._snapshot: ApplicationModelSnapshot | None = None
 
     def __repr__(self) -> str:
         return f"DistributedApplicationModel(handle={self._handle.handle_id})"
@@ -3826,13 +4936,147 @@ class DistributedApplicationModel:
         )
         return typing.cast(AbstractResource, result)
 
+    def snapshot(self, *, refresh: bool = False) -> ApplicationModelSnapshot:
+        """
+        Gets every resource in the model with its type, annotations, endpoints and relationships.
+
+        The model is fetched in one call and indexed locally by name, type and relationship,
+        so lookups from callbacks and pipeline steps cost no round trips. The snapshot is
+        kept until `refresh=True` is passed.
+
+        Against an AppHost that can't export a snapshot, only names and types are filled in,
+        fetched with one pipelined batch. The AppHost has no capability to list annotations
+        or relationships, so entries have no 'Annotations', 'Endpoints' or 'Relationships',
+        and the snapshot's relationship lookups raise NotImplementedError.
+        """
+        if self._snapshot is not None and not refresh:
+            return self._snapshot
+        supported, result = self._client._invoke_if_supported(
+            'Aspire.Hosting/getDistributedApplicationModelSnapshot',
+            {'model': self._handle},
+        )
+        if supported:
+            entries = typing.cast(list[ResourceSnapshot], result)
+            for entry in entries:
+                entry['Resource'] = _wrap_if_handle(entry['Resource'], self._client)
+            self._snapshot = ApplicationModelSnapshot(entries)
+            return self._snapshot
+        resources = [_wrap_if_handle(resource, self._client) for resource in self.get_resources()]
+        names = self._client.invoke_capabilities(
+            ('Aspire.Hosting/getResourceName', {'resource': resource}) for resource in resources
+        )
+        entries = [
+            {'Resource': resource, 'Name': name, 'Type': getattr(resource, 'handle', resource).type_id}
+            for resource, name in zip(resources, names)
+        ]
+        self._snapshot = ApplicationModelSnapshot(entries, relationships=False)
+        return self._snapshot
+
+
+class ApplicationModelSnapshot:
+    """
+    An immutable local view of a DistributedApplicationModel, indexed for O(1) lookups.
+
+    Names are matched case-insensitively, as in the AppHost. Types can be given as the
+    full ATS type id or as the type name alone, e.g. 'RedisResource'.
+
+    `relationships=False` marks a snapshot built without relationship data, whose
+    `related()`, `referrers()` and `children()` raise NotImplementedError rather than
+    report that no resource has any.
+    """
+
+    def __init__(self, resources: typing.Iterable[ResourceSnapshot], *, relationships: bool = True) -> None:
+        self._resources = list(resources)
+        self._has_relationships = relationships
+        self._by_name: dict[str, ResourceSnapshot] = {}
+        self._by_type: dict[str, list[ResourceSnapshot]] = {}
+        self._related: dict[tuple[str, str | None], list[ResourceSnapshot]] = {}
+        self._referrers: dict[tuple[str, str | None], list[ResourceSnapshot]] = {}
+        for resource in self._resources:
+            self._by_name[resource['Name'].lower()] = resource
+            type_id = resource.get('Type', '')
+            type_name = type_id.rsplit('/', 1)[-1].rsplit('.', 1)[-1]
+            for key in {type_id, type_name}:
+                self._by_type.setdefault(key, []).append(resource)
+        for resource in self._resources:
+            source = resource['Name'].lower()
+            for relationship in resource.get('Relationships', []):
+                target = self._by_name.get(relationship['Resource'].lower())
+                if target is None:
+                    continue
+                for kind in (None, relationship.get('Type')):
+                    self._related.setdefault((source, kind), []).append(target)
+                    self._referrers.setdefault((target['Name'].lower(), kind), []).append(resource)
+
+    def __repr__(self) -> str:
+        return f"ApplicationModelSnapshot(resources={len(self._resources)})"
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __iter__(self) -> typing.Iterator[ResourceSnapshot]:
+        return iter(self._resources)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._by_name
+
+    def __getitem__(self, name: str) -> ResourceSnapshot:
+        return self._by_name[name.lower()]
+
+    @_uncached_property
+    def names(self) -> list[str]:
+        """The resource names, in model order."""
+        return [resource['Name'] for resource in self._resources]
+
+    def get(self, name: str) -> ResourceSnapshot | None:
+        """Gets a resource by name, or None if there is no such resource."""
+        return self._by_name.get(name.lower())
+
+    def of_type(self, type_name: str) -> list[ResourceSnapshot]:
+        """Gets the resources of a type, given as an ATS type id or a type name."""
+        return list(self._by_type.get(type_name, ()))
+
+    def related(self, name: str, relationship_type: str | None = None) -> list[ResourceSnapshot]:
+        """Gets the resources that `name` has a relationship to, optionally of one type only."""
+        self._check_relationships()
+        return list(self._related.get((name.lower(), relationship_type), ()))
+
+    def referrers(self, name: str, relationship_type: str | None = None) -> list[ResourceSnapshot]:
+        """Gets the resources that have a relationship to `name`, optionally of one type only."""
+        self._check_relationships()
+        return list(self._referrers.get((name.lower(), relationship_type), ()))
+
+    def _check_relationships(self) -> None:
+        if not self._has_relationships:
+            raise NotImplementedError(
+                "This snapshot has no relationships: the AppHost does not export "
+                "getDistributedApplicationModelSnapshot, and has no other capability that lists them."
+            )
+
+    def children(self, name: str) -> list[ResourceSnapshot]:
+        """Gets the resources whose parent is `name`."""
+        return self.referrers(name, 'Parent')
+
+
+class DockerfileStatement(typing.TypedDict, total=False):
+    Kind: str
+    Arguments: dict[str, typing.Any]
+    Instructions: list[DockerfileStatement]
+
 
 class DockerfileBuilder:
-    """Type class for DockerfileBuilder."""
+    """
+    Type class for DockerfileBuilder.
+
+    Statements are recorded in a local document instead of being sent one by one. The
+    document is sent to the AppHost in a single call when the builder callback returns,
+    or earlier with `flush()`. `document` exposes the recorded statements.
+    """
 
     def __init__(self, handle: Handle, client: AspireClient) -> None:
         self._handle = handle
         self._client = client
+        self._statements: list[DockerfileStatement] = []
 
     def __repr__(self) -> str:
         return f"DockerfileBuilder(handle={self._handle.handle_id})"
@@ -3842,41 +5086,66 @@ class DockerfileBuilder:
         """The underlying object reference handle."""
         return self._handle
 
+    @_uncached_property
+    def document(self) -> list[DockerfileStatement]:
+        """The statements recorded since the last flush, with each stage's instructions nested under its FROM."""
+        return self._statements
+
     def arg(self, name: str, *, default_value: str | None = None) -> DockerfileBuilder:
         """Adds a global ARG statement to the Dockerfile"""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['name'] = name
+        arguments: dict[str, typing.Any] = {'name': name}
         if default_value is not None:
-            rpc_args['defaultValue'] = default_value
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileBuilderArg',
-            rpc_args,
-        )
-        return typing.cast(DockerfileBuilder, result)
+            arguments['defaultValue'] = default_value
+        self._statements.append({'Kind': 'dockerfileBuilderArg', 'Arguments': arguments})
+        return self
 
     def from_(self, image: str, *, stage_name: str | None = None) -> DockerfileStage:
         """Adds a FROM statement to start a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['image'] = image
+        arguments: dict[str, typing.Any] = {'image': image}
         if stage_name is not None:
-            rpc_args['stageName'] = stage_name
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileBuilderFrom',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+            arguments['stageName'] = stage_name
+        statement: DockerfileStatement = {'Kind': 'dockerfileBuilderFrom', 'Arguments': arguments, 'Instructions': []}
+        self._statements.append(statement)
+        return DockerfileStage(statement, self._client)
 
     def add_container_files_stages(self, resource: AbstractResource, *, logger: AbstractLogger | None = None) -> DockerfileBuilder:
         """Adds Dockerfile stages for published container files"""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['resource'] = resource
+        arguments: dict[str, typing.Any] = {'resource': resource}
         if logger is not None:
-            rpc_args['logger'] = logger
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileBuilderAddContainerFilesStages',
-            rpc_args,
-        )
-        return typing.cast(DockerfileBuilder, result)
+            arguments['logger'] = logger
+        self._statements.append({'Kind': 'dockerfileBuilderAddContainerFilesStages', 'Arguments': arguments})
+        return self
+
+    def flush(self) -> None:
+        """Sends the recorded statements to the AppHost as one document."""
+        statements, self._statements = self._statements, []
+        if not statements:
+            return
+        supported, _ = self._client._invoke_if_supported(
+            'Aspire.Hosting/dockerfileBuilderApply',
+            {'builder': self._handle, 'statements': statements},
+        )
+        if supported:
+            return
+        # Dockerfile statements are order sensitive, so they are replayed with _invoke_in_order()
+        for statement in statements:
+            stage = self._client.invoke_capability(
+                f"Aspire.Hosting/{statement['Kind']}",
+                {'builder': self._handle, **statement['Arguments']},
+            )
+            self._client._invoke_in_order(
+                (f"Aspire.Hosting/{instruction['Kind']}", {'stage': stage, **instruction['Arguments']})
+                for instruction in statement.get('Instructions', ())
+            )
+
+
+def _apply_dockerfile_builder(callback: typing.Callable[[DockerfileBuilderCallbackContext], None]) -> typing.Callable[[DockerfileBuilderCallbackContext], None]:
+    """Wraps a Dockerfile builder callback so that the recorded document is sent when it returns."""
+    @_wraps(callback)
+    def apply(context: DockerfileBuilderCallbackContext) -> None:
+        callback(context)
+        context.builder.flush()
+    return apply
 
 
 class DockerfileBuilderCallbackContext:
@@ -3956,184 +5225,262 @@ class DockerfileFactoryContext:
 
 
 class DockerfileStage:
-    """Type class for DockerfileStage."""
+    """
+    Type class for DockerfileStage.
 
-    def __init__(self, handle: Handle, client: AspireClient) -> None:
-        self._handle = handle
+    Stages are created by `DockerfileBuilder.from_()`, and their instructions are recorded
+    under the FROM statement in the builder's document, so they have no AppHost handle
+    of their own.
+    """
+
+    def __init__(self, statement: DockerfileStatement, client: AspireClient) -> None:
         self._client = client
+        self._instructions: list[DockerfileStatement] = statement['Instructions']
+        self._image: str = statement['Arguments']['image']
 
     def __repr__(self) -> str:
-        return f"DockerfileStage(handle={self._handle.handle_id})"
+        return f"DockerfileStage(image={self._image!r})"
 
-    @_uncached_property
-    def handle(self) -> Handle:
-        """The underlying object reference handle."""
-        return self._handle
+    def _record(self, kind: str, arguments: dict[str, typing.Any]) -> DockerfileStage:
+        self._instructions.append({'Kind': kind, 'Arguments': arguments})
+        return self
 
     def arg(self, name: str, *, default_value: str | None = None) -> DockerfileStage:
         """Adds an ARG statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['name'] = name
+        arguments: dict[str, typing.Any] = {}
+        arguments['name'] = name
         if default_value is not None:
-            rpc_args['defaultValue'] = default_value
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileStageArg',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+            arguments['defaultValue'] = default_value
+        return self._record('dockerfileStageArg', arguments)
 
     def work_dir(self, path: str) -> DockerfileStage:
         """Adds a WORKDIR statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['path'] = path
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/workDir',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['path'] = path
+        return self._record('workDir', arguments)
 
     def run(self, command: str) -> DockerfileStage:
         """Adds a RUN statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['command'] = command
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileStageRun',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['command'] = command
+        return self._record('dockerfileStageRun', arguments)
 
     def copy(self, source: str, destination: str, *, chown: str | None = None) -> DockerfileStage:
         """Adds a COPY statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['source'] = source
-        rpc_args['destination'] = destination
+        arguments: dict[str, typing.Any] = {}
+        arguments['source'] = source
+        arguments['destination'] = destination
         if chown is not None:
-            rpc_args['chown'] = chown
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileStageCopy',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+            arguments['chown'] = chown
+        return self._record('dockerfileStageCopy', arguments)
 
     def copy_from(self, from_: str, source: str, destination: str, *, chown: str | None = None) -> DockerfileStage:
         """Adds a COPY --from statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['from'] = from_
-        rpc_args['source'] = source
-        rpc_args['destination'] = destination
+        arguments: dict[str, typing.Any] = {}
+        arguments['from'] = from_
+        arguments['source'] = source
+        arguments['destination'] = destination
         if chown is not None:
-            rpc_args['chown'] = chown
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileStageCopyFrom',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+            arguments['chown'] = chown
+        return self._record('dockerfileStageCopyFrom', arguments)
 
     def env(self, name: str, value: str) -> DockerfileStage:
         """Adds an ENV statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['name'] = name
-        rpc_args['value'] = value
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/env',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['name'] = name
+        arguments['value'] = value
+        return self._record('env', arguments)
 
     def expose(self, port: int) -> DockerfileStage:
         """Adds an EXPOSE statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['port'] = port
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/expose',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['port'] = port
+        return self._record('expose', arguments)
 
     def cmd(self, command: typing.Iterable[str]) -> DockerfileStage:
         """Adds a CMD statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['command'] = command
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/cmd',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['command'] = list(command)
+        return self._record('cmd', arguments)
 
     def entrypoint(self, command: typing.Iterable[str]) -> DockerfileStage:
         """Adds an ENTRYPOINT statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['command'] = command
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/entrypoint',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['command'] = list(command)
+        return self._record('entrypoint', arguments)
 
     def run_with_mounts(self, command: str, mounts: typing.Iterable[str]) -> DockerfileStage:
         """Adds a RUN statement with mounts to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['command'] = command
-        rpc_args['mounts'] = mounts
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/runWithMounts',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['command'] = command
+        arguments['mounts'] = list(mounts)
+        return self._record('runWithMounts', arguments)
 
     def user(self, user: str) -> DockerfileStage:
         """Adds a USER statement to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['user'] = user
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/user',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['user'] = user
+        return self._record('user', arguments)
 
     def empty_line(self) -> DockerfileStage:
         """Adds an empty line to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/emptyLine',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        return self._record('emptyLine', arguments)
 
     def comment(self, comment: str) -> DockerfileStage:
         """Adds a comment to a Dockerfile stage"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['comment'] = comment
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/comment',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+        arguments: dict[str, typing.Any] = {}
+        arguments['comment'] = comment
+        return self._record('comment', arguments)
 
     def add_container_files(self, resource: AbstractResource, root_destination_path: str, *, logger: AbstractLogger | None = None) -> DockerfileStage:
         """Adds COPY --from statements for published container files"""
-        rpc_args: dict[str, typing.Any] = {'stage': self._handle}
-        rpc_args['resource'] = resource
-        rpc_args['rootDestinationPath'] = root_destination_path
+        arguments: dict[str, typing.Any] = {}
+        arguments['resource'] = resource
+        arguments['rootDestinationPath'] = root_destination_path
         if logger is not None:
-            rpc_args['logger'] = logger
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/dockerfileStageAddContainerFiles',
-            rpc_args,
-        )
-        return typing.cast(DockerfileStage, result)
+            arguments['logger'] = logger
+        return self._record('dockerfileStageAddContainerFiles', arguments)
+
+
+class _allocation_property(_cached_property):
+    """
+    A cached EndpointReference property whose value can change when the endpoint is
+    allocated. The value is cached only once the reference will be invalidated on
+    allocation, and is read from the AppHost every time otherwise.
+    """
+
+    def __get__(self, instance: typing.Any, owner: type | None = None) -> typing.Any:
+        if instance is None:
+            return self
+        if self.attrname in instance.__dict__:
+            return instance.__dict__[self.attrname]
+        if instance._watch_allocation():
+            return super().__get__(instance, owner)
+        return self.func(instance)
 
 
 class EndpointReference:
     """Type class for EndpointReference."""
 
+    # Cached properties fetched by prefetch(), keyed by attribute name
+    _PREFETCH_PROPERTIES: dict[str, str] = {
+        'resource': 'resource',
+        'endpoint_name': 'endpointName',
+        'error_message': 'errorMessage',
+        'is_allocated': 'isAllocated',
+        'exists': 'exists',
+        'is_http': 'isHttp',
+        'is_https': 'isHttps',
+        'tls_enabled': 'tlsEnabled',
+        'is_http_scheme_named_endpoint': 'isHttpSchemeNamedEndpoint',
+        'exclude_reference_endpoint': 'excludeReferenceEndpoint',
+        'port': 'port',
+        'target_port': 'targetPort',
+        'host': 'host',
+        'scheme': 'scheme',
+        'url': 'url',
+    }
+    # Properties that never change once the reference exists
+    _STABLE_PROPERTIES = frozenset({'resource', 'endpoint_name'})
+
     def __init__(self, handle: Handle, client: AspireClient) -> None:
         self._handle = handle
         self._client = client
+        # The resource wrapper the reference was obtained from, if any
+        self._owner: AbstractResourceWithEndpoints | None = None
 
     def __repr__(self) -> str:
         return f"EndpointReference(handle={self._handle.handle_id})"
 
+    def prefetch(self) -> typing.Self:
+        """
+        Fetches every cached property of the endpoint in a single round trip.
+
+        Properties that the AppHost cannot provide yet (for example `port` before the
+        endpoint is allocated) are left unset and raise when read, as before.
+        """
+        EndpointReference.prefetch_many([self])
+        return self
+
+    @staticmethod
+    def prefetch_many(endpoints: typing.Iterable[EndpointReference]) -> None:
+        """
+        Fetches the cached properties of several endpoints as one pipelined batch.
+
+        Values that can change when an endpoint is allocated, such as `is_allocated`, `port`
+        and `url`, are discarded when the resource's ResourceEndpointsAllocatedEvent fires,
+        and re-read on next access.
+        """
+        endpoints = list(endpoints)
+        if not endpoints:
+            return
+        names = list(EndpointReference._PREFETCH_PROPERTIES.items())
+        results = endpoints[0]._client.invoke_capabilities(
+            (
+                (f'Aspire.Hosting.ApplicationModel/EndpointReference.{capability}', {'context': endpoint._handle})
+                for endpoint in endpoints
+                for _, capability in names
+            ),
+            return_exceptions=True,
+        )
+        for index, endpoint in enumerate(endpoints):
+            values = dict(zip((name for name, _ in names), results[index * len(names):(index + 1) * len(names)]))
+            for name in EndpointReference._STABLE_PROPERTIES:
+                if not isinstance(values[name], Exception):
+                    endpoint.__dict__.setdefault(name, values[name])
+            if not endpoint._watch_allocation():
+                continue
+            for name, value in values.items():
+                if not isinstance(value, Exception):
+                    endpoint.__dict__[name] = value
+
+    def invalidate(self) -> None:
+        """Discards cached properties that can change when the endpoint is allocated."""
+        for name in self._PREFETCH_PROPERTIES:
+            if name not in self._STABLE_PROPERTIES:
+                self.__dict__.pop(name, None)
+
+    def _watch_allocation(self) -> bool:
+        """
+        Arranges for this reference to be invalidated when its resource's endpoints are
+        allocated. Each resource subscribes to ResourceEndpointsAllocated once, and the
+        handler invalidates every reference registered with it. Returns False if the
+        subscription failed, in which case allocation-dependent values must not be cached.
+        """
+        watching = self.__dict__.get('_watching')
+        if watching is not None:
+            return watching
+        client = self._client
+        owner = self._owner if self._owner is not None else self.resource
+        if not isinstance(owner, AbstractResourceWithEndpoints):
+            self._watching = False
+            return False
+        with client._lock:
+            references = owner.__dict__.get('_endpoint_references')
+            subscribe = references is None
+            if subscribe:
+                references = owner.__dict__['_endpoint_references'] = weakref.WeakSet()
+            if references is not False:
+                references.add(self)
+        if subscribe:
+            def on_allocated(event: ResourceEndpointsAllocatedEvent) -> None:
+                with client._lock:
+                    allocated = list(references)
+                for reference in allocated:
+                    reference.invalidate()
+
+            try:
+                owner.on_resource_endpoints_allocated(on_allocated)
+            except AspireError as e:
+                # Without the event there is no way to know when values go stale, so don't keep them
+                _logger.debug("Could not subscribe to endpoint allocation for %r: %s", owner, e)
+                with client._lock:
+                    owner.__dict__['_endpoint_references'] = False
+                references = False
+        self._watching = references is not False
+        return self._watching
+
     @_uncached_property
     def handle(self) -> Handle:
         """The underlying object reference handle."""
@@ -4157,7 +5504,7 @@ class EndpointReference:
         )
         return typing.cast(str, result)
 
-    @_cached_property
+    @_allocation_property
     def error_message(self) -> str | None:
         """Gets or sets a custom error message to be thrown when the endpoint annotation is not found."""
         result = self._client.invoke_capability(
@@ -4166,7 +5513,7 @@ class EndpointReference:
         )
         return typing.cast(str | None, result)
 
-    @_cached_property
+    @_allocation_property
     def is_allocated(self) -> bool:
         """Gets a value indicating whether the endpoint is allocated."""
         result = self._client.invoke_capability(
@@ -4175,7 +5522,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def exists(self) -> bool:
         """Gets a value indicating whether the endpoint exists."""
         result = self._client.invoke_capability(
@@ -4184,7 +5531,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def is_http(self) -> bool:
         """Gets a value indicating whether the endpoint uses HTTP scheme."""
         result = self._client.invoke_capability(
@@ -4193,7 +5540,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def is_https(self) -> bool:
         """Gets a value indicating whether the endpoint uses HTTPS scheme."""
         result = self._client.invoke_capability(
@@ -4202,7 +5549,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def tls_enabled(self) -> bool:
         """Gets a value indicating whether TLS is enabled for this endpoint."""
         result = self._client.invoke_capability(
@@ -4211,7 +5558,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def is_http_scheme_named_endpoint(self) -> bool:
         """Gets a value indicating whether the endpoint name is "http" or "https", ignoring case. This is a convention used to identify endpoints that will be resolved based on the scheme of the endpoint in service discovery rather than by the specific endpoint name. This is done to allow http endpoints that are dynamically updated to https to be mapped correctly despite the endpoint name no longer matching the scheme."""
         result = self._client.invoke_capability(
@@ -4220,7 +5567,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def exclude_reference_endpoint(self) -> bool:
         """Gets a value indicating whether this endpoint is excluded from the default set when referencing the resource's endpoints."""
         result = self._client.invoke_capability(
@@ -4229,7 +5576,7 @@ class EndpointReference:
         )
         return typing.cast(bool, result)
 
-    @_cached_property
+    @_allocation_property
     def port(self) -> int:
         """Gets the port for this endpoint."""
         result = self._client.invoke_capability(
@@ -4238,7 +5585,7 @@ class EndpointReference:
         )
         return typing.cast(int, result)
 
-    @_cached_property
+    @_allocation_property
     def target_port(self) -> int | None:
         """Gets the target port for this endpoint. If the port is dynamically allocated, this will return `null`."""
         result = self._client.invoke_capability(
@@ -4247,7 +5594,7 @@ class EndpointReference:
         )
         return typing.cast(int | None, result)
 
-    @_cached_property
+    @_allocation_property
     def host(self) -> str:
         """Gets the host for this endpoint."""
         result = self._client.invoke_capability(
@@ -4256,7 +5603,7 @@ class EndpointReference:
         )
         return typing.cast(str, result)
 
-    @_cached_property
+    @_allocation_property
     def scheme(self) -> str:
         """Gets the scheme for this endpoint."""
         result = self._client.invoke_capability(
@@ -4265,7 +5612,7 @@ class EndpointReference:
         )
         return typing.cast(str, result)
 
-    @_cached_property
+    @_allocation_property
     def url(self) -> str:
         """Gets the URL for this endpoint."""
         result = self._client.invoke_capability(
@@ -4928,6 +6275,137 @@ class LogFacade:
         )
 
 
+class AspireLogHandler(logging.Handler):
+    """
+    A `logging.Handler` that forwards records to an AbstractLogger or LogFacade in batches.
+
+    Records are buffered and shipped by a background thread every `flush_interval` seconds, or
+    as soon as `batch_size` records are waiting, through the `logBatch` capability. AppHosts
+    without that capability receive one multi-line message per run of records at the same
+    level, sent in order. Pending records are flushed by `flush()`, when the handler is used
+    as a context manager (for example around a pipeline step), and on `close()`, which
+    `logging.shutdown()` calls at interpreter exit.
+
+    Example:
+        ```python
+        def step(context: PipelineStepContext) -> None:
+            with AspireLogHandler(context.logger) as handler:
+                log = logging.getLogger("deploy")
+                log.addHandler(handler)
+                log.info("Uploading artifacts...")
+        ```
+    """
+
+    # Python logging levels mapped to .NET LogLevel names, highest first.
+    _LEVEL_NAMES = (
+        (logging.CRITICAL, "Critical"),
+        (logging.ERROR, "Error"),
+        (logging.WARNING, "Warning"),
+        (logging.INFO, "Information"),
+        (logging.DEBUG, "Debug"),
+    )
+    _FACADE_CAPABILITIES = {
+        "Critical": 'Aspire.Hosting.ApplicationModel/error',
+        "Error": 'Aspire.Hosting.ApplicationModel/error',
+        "Warning": 'Aspire.Hosting.ApplicationModel/warning',
+        "Information": 'Aspire.Hosting.ApplicationModel/info',
+        "Debug": 'Aspire.Hosting.ApplicationModel/debug',
+        "Trace": 'Aspire.Hosting.ApplicationModel/debug',
+    }
+
+    def __init__(self, logger: AbstractLogger | LogFacade, *, level: int = logging.NOTSET, batch_size: int = 100, flush_interval: float = 0.5) -> None:
+        super().__init__(level)
+        self._target = logger
+        self._client = logger._client
+        self._target_key = 'context' if isinstance(logger, LogFacade) else 'logger'
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer: list[tuple[str, str]] = []
+        self._buffer_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="aspire-log-flush", daemon=True)
+        self._flusher.start()
+
+    def __repr__(self) -> str:
+        return f"AspireLogHandler(target={self._target!r})"
+
+    def __enter__(self) -> AspireLogHandler:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+    @classmethod
+    def _level_name(cls, levelno: int) -> str:
+        for threshold, name in cls._LEVEL_NAMES:
+            if levelno >= threshold:
+                return name
+        return "Trace"
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Never forward the client's own logging; sending a batch would log again.
+        if record.name == __name__ or record.name.startswith(__name__ + "."):
+            return
+        try:
+            entry = (self._level_name(record.levelno), self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self._batch_size
+        if full:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                _logger.debug("Failed to ship log batch: %s", e)
+
+    def _send(self, entries: list[tuple[str, str]]) -> None:
+        handle = self._target.handle
+        supported, _ = self._client._invoke_if_supported(
+            'Aspire.Hosting/logBatch',
+            {self._target_key: handle, 'entries': [{'level': level, 'message': message} for level, message in entries]},
+        )
+        if supported:
+            return
+        # Consecutive records at the same level are joined into one message
+        calls: list[tuple[str, dict[str, typing.Any] | None]] = []
+        for level, group in itertools.groupby(entries, key=lambda entry: entry[0]):
+            message = "\n".join(message for _, message in group)
+            if self._target_key == 'context':
+                calls.append((self._FACADE_CAPABILITIES[level], {'context': handle, 'message': message}))
+            else:
+                calls.append(('Aspire.Hosting/log', {'logger': handle, 'level': level, 'message': message}))
+        self._client._invoke_in_order(calls)
+
+    def flush(self) -> None:
+        """Ships all buffered records and waits for the AppHost to acknowledge them."""
+        with self._send_lock:
+            with self._buffer_lock:
+                entries, self._buffer = self._buffer, []
+            if entries and self._client.connected:
+                self._send(entries)
+
+    def close(self) -> None:
+        """Flushes pending records and stops the background flusher."""
+        if not self._closed:
+            self._closed = True
+            self._wake.set()
+            try:
+                self.flush()
+            except Exception as e:
+                _logger.debug("Failed to ship final log batch: %s", e)
+        super().close()
+
+
 class PipelineConfigurationContext:
     """Type class for PipelineConfigurationContext."""
 
@@ -5065,6 +6543,39 @@ class PipelineEditor:
         )
         return result
 
+    def snapshot(self) -> PipelineGraph:
+        """Builds a local graph of all configured steps using a fixed number of pipelined batches."""
+        steps = list(self.steps())
+        properties = ('name', 'description', 'dependsOnSteps', 'requiredBySteps', 'tags')
+        values = self._client.invoke_capabilities(
+            (f'Aspire.Hosting.Pipelines/PipelineStep.{prop}', {'context': step})
+            for step in steps for prop in properties
+        )
+        rows = [values[i:i + len(properties)] for i in range(0, len(values), len(properties))]
+        lists = [value._handle if isinstance(value, AspireList) else value for row in rows for value in row[2:]]
+        lengths = self._client.invoke_capabilities(
+            ('Aspire.Hosting/List.length', {'list': items}) for items in lists
+        )
+        flat = self._client.invoke_capabilities(
+            ('Aspire.Hosting/List.get', {'list': items, 'index': index})
+            for items, length in zip(lists, lengths) for index in range(int(length))
+        )
+        contents: list[list[str]] = []
+        offset = 0
+        for length in lengths:
+            contents.append(flat[offset:offset + int(length)])
+            offset += int(length)
+        return PipelineGraph(
+            PipelineStepInfo(
+                Name=row[0],
+                Description=row[1],
+                DependsOn=contents[3 * i],
+                RequiredBy=contents[3 * i + 1],
+                Tags=contents[3 * i + 2],
+            )
+            for i, row in enumerate(rows)
+        )
+
     def steps_by_tag(self, tag: str) -> typing.Iterable[PipelineStep]:
         """Gets all pipeline steps that have the specified tag."""
         rpc_args: dict[str, typing.Any] = {'context': self._handle}
@@ -5164,6 +6675,158 @@ class PipelineStep:
         )
 
 
+class PipelineTimings:
+    """
+    Wall-clock timings of pipeline step callbacks run by this process.
+
+    Callbacks registered through `add_step` and `with_pipeline_step_factory` are timed
+    automatically and recorded under their step name on `AspireClient.pipeline_timings`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return f"PipelineTimings(steps={len(self._durations)})"
+
+    def record(self, step_name: str, seconds: float) -> None:
+        """Records the duration of a step. Repeated runs of the same step accumulate."""
+        with self._lock:
+            self._durations[step_name] = self._durations.get(step_name, 0.0) + seconds
+
+    def wrap(self, step_name: str, callback: typing.Callable[[PipelineStepContext], None]) -> typing.Callable[[PipelineStepContext], None]:
+        """Returns a callback that records its own duration under `step_name`."""
+        @_wraps(callback)
+        def timed(context: PipelineStepContext) -> None:
+            started = time.perf_counter()
+            try:
+                callback(context)
+            finally:
+                self.record(step_name, time.perf_counter() - started)
+
+        return timed
+
+    def durations(self) -> dict[str, float]:
+        """A copy of the recorded durations in seconds, by step name."""
+        with self._lock:
+            return dict(self._durations)
+
+
+class PipelineGraph:
+    """
+    A local, read-only snapshot of the pipeline step graph.
+
+    `RequiredBy` relationships are folded into `DependsOn` edges, as the pipeline does
+    when it is built. All analysis runs in Python without further calls to the AppHost.
+    Take one with `PipelineEditor.snapshot()` from a `configure` callback, once the steps
+    are known.
+    """
+
+    def __init__(self, steps: typing.Iterable[PipelineStepInfo]) -> None:
+        self.steps: dict[str, PipelineStepInfo] = {step["Name"]: step for step in steps}
+        self._depends_on: dict[str, set[str]] = {name: set() for name in self.steps}
+        for name, step in self.steps.items():
+            for dependency in step.get("DependsOn") or []:
+                if dependency in self.steps:
+                    self._depends_on[name].add(dependency)
+            for dependent in step.get("RequiredBy") or []:
+                if dependent in self.steps:
+                    self._depends_on[dependent].add(name)
+        self._dependents: dict[str, set[str]] = {name: set() for name in self.steps}
+        for name, dependencies in self._depends_on.items():
+            for dependency in dependencies:
+                self._dependents[dependency].add(name)
+
+    def __repr__(self) -> str:
+        return f"PipelineGraph(steps={len(self.steps)})"
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def dependencies(self, step_name: str) -> set[str]:
+        """The steps that `step_name` directly depends on."""
+        return set(self._depends_on[step_name])
+
+    def dependents(self, step_name: str) -> set[str]:
+        """The steps that directly depend on `step_name`."""
+        return set(self._dependents[step_name])
+
+    def topological_order(self) -> list[str]:
+        """All step names ordered so that every step follows its dependencies."""
+        remaining = {name: len(dependencies) for name, dependencies in self._depends_on.items()}
+        ready = sorted(name for name, count in remaining.items() if count == 0)
+        order: list[str] = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in sorted(self._dependents[name]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.steps):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Pipeline contains a dependency cycle between steps: {cycle}")
+        return order
+
+    def parallel_groups(self) -> list[list[str]]:
+        """Steps grouped by dependency depth. Steps in the same group can run concurrently."""
+        depth: dict[str, int] = {}
+        for name in self.topological_order():
+            depth[name] = 1 + max((depth[dependency] for dependency in self._depends_on[name]), default=-1)
+        groups: list[list[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, level in depth.items():
+            groups[level].append(name)
+        return [sorted(group) for group in groups]
+
+    def critical_path(self, durations: typing.Mapping[str, float]) -> tuple[list[str], float]:
+        """The chain of dependent steps with the largest total duration, and that duration."""
+        finish: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+        for name in self.topological_order():
+            start, before = 0.0, None
+            for dependency in self._depends_on[name]:
+                if finish[dependency] > start or before is None:
+                    start, before = max(start, finish[dependency]), dependency
+            finish[name] = start + durations.get(name, 0.0)
+            previous[name] = before
+        if not finish:
+            return [], 0.0
+        step: str | None = max(finish, key=lambda name: finish[name])
+        total = finish[typing.cast(str, step)]
+        path: list[str] = []
+        while step is not None:
+            path.append(step)
+            step = previous[step]
+        return path[::-1], total
+
+    def slack(self, durations: typing.Mapping[str, float]) -> dict[str, float]:
+        """How long each step could be delayed without lengthening the pipeline."""
+        order = self.topological_order()
+        earliest: dict[str, float] = {}
+        for name in order:
+            earliest[name] = max((earliest[d] + durations.get(d, 0.0) for d in self._depends_on[name]), default=0.0)
+        end = max((earliest[name] + durations.get(name, 0.0) for name in order), default=0.0)
+        latest: dict[str, float] = {}
+        for name in reversed(order):
+            latest[name] = min((latest[d] for d in self._dependents[name]), default=end) - durations.get(name, 0.0)
+        return {name: latest[name] - earliest[name] for name in order}
+
+    def report(self, durations: typing.Mapping[str, float]) -> str:
+        """A text report of the critical path, per-step timings and parallel groups."""
+        path, total = self.critical_path(durations)
+        slack = self.slack(durations)
+        lines = [f"Critical path ({total:.2f}s): {' -> '.join(path) or '(empty)'}", "", f"{'seconds':>9} {'slack':>9}  step"]
+        for name in sorted(self.steps, key=lambda name: durations.get(name, 0.0), reverse=True):
+            marker = "*" if name in path else " "
+            lines.append(f"{durations.get(name, 0.0):9.2f} {slack[name]:9.2f} {marker}{name}")
+        lines.append("")
+        lines.append("Steps that can run in parallel:")
+        for level, group in enumerate(self.parallel_groups()):
+            lines.append(f"  {level}: {', '.join(group)}")
+        return "\n".join(lines)
+
+
 class PipelineStepContext:
     """Type class for PipelineStepContext."""
 
@@ -5483,6 +7146,71 @@ class ResourceCommandService:
         )
         return typing.cast(ExecuteCommandResult, result)
 
+    def execute_many(
+        self,
+        resources: typing.Iterable[str | AbstractResource],
+        command_name: str,
+        *,
+        arguments: typing.Mapping[str, str] | None = None,
+        concurrency: int = 8,
+        timeout: int | None = None,
+        stop_on_failure: bool = False,
+        on_result: typing.Callable[[str, ExecuteCommandResult], None] | None = None,
+    ) -> ResourceCommandReport:
+        """
+        Executes a command on many resources, running up to `concurrency` at once.
+
+        `on_result` is called with the resource name and result as each command completes,
+        in completion order. A command that raises is reported as a failed result with the
+        error message. With `stop_on_failure`, commands that have not started yet when one
+        fails are skipped and reported as canceled. Returns a report covering every resource.
+        """
+        started = time.perf_counter()
+        resources = list(resources)
+        handles = [resource for resource in resources if not isinstance(resource, str)]
+        resolved = iter(self._client.invoke_capabilities(
+            ('Aspire.Hosting/getResourceName', {'resource': resource}) for resource in handles
+        ))
+        names = [resource if isinstance(resource, str) else typing.cast(str, next(resolved)) for resource in resources]
+
+        report: ResourceCommandReport = {
+            'CommandName': command_name, 'Results': {}, 'Succeeded': [], 'Failed': [], 'Canceled': [],
+        }
+
+        def execute(resource: str | AbstractResource) -> ExecuteCommandResult:
+            try:
+                return self.execute_command(resource, command_name, arguments=arguments, timeout=timeout)
+            except Exception as e:
+                return {'Success': False, 'Canceled': False, 'ErrorMessage': str(e)}
+
+        def record(name: str, result: ExecuteCommandResult) -> None:
+            report['Results'][name] = result
+            if result.get('Success'):
+                report['Succeeded'].append(name)
+            elif result.get('Canceled'):
+                report['Canceled'].append(name)
+            else:
+                report['Failed'].append(name)
+            if on_result is not None:
+                on_result(name, result)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="aspire-command") as executor:
+            futures = {executor.submit(execute, resource): name for resource, name in zip(resources, names)}
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                record(futures[future], result)
+                if stop_on_failure and not result.get('Success'):
+                    for pending in futures:
+                        pending.cancel()
+            for future, name in futures.items():
+                if future.cancelled():
+                    record(name, {'Success': False, 'Canceled': True, 'ErrorMessage': 'Skipped after an earlier failure'})
+
+        report['ElapsedSeconds'] = time.perf_counter() - started
+        return report
+
 
 class ResourceEndpointsAllocatedEvent:
     """Type class for ResourceEndpointsAllocatedEvent."""
@@ -5631,6 +7359,154 @@ class ResourceNotificationService:
             rpc_args
         )
 
+    def watch(self, resources: typing.Iterable[AbstractResource], *, target_states: typing.Iterable[str] | None = None) -> ResourceStateWatch:
+        """Streams state updates for a set of resources over the existing connection."""
+        return ResourceStateWatch(self, resources, target_states=target_states)
+
+
+class ResourceStateWatch:
+    """
+    A multiplexed stream of ResourceEventDto updates for a set of resources.
+
+    Subscribes once through the `watchResourceStates` capability, with the target states
+    filtered on the server, and receives every update as a callback over the existing
+    connection. AppHosts that do not export the capability are watched through each
+    resource's BeforeResourceStarted, ResourceReady and ResourceStopped events instead:
+    an event makes the iterating thread read the resource's state with
+    `tryGetResourceState`, and only changes are yielded. That fallback reports the state
+    at those points of the lifecycle, and the state when the watch starts, rather than
+    every intermediate state.
+
+    Iterate synchronously or with `async for`. Close the watch, or use it as a context manager,
+    to end the subscription.
+
+    Example:
+        ```python
+        with notifications.watch([api, worker], target_states=["Running"]) as updates:
+            for update in updates:
+                print(update["ResourceName"], update["State"])
+        ```
+    """
+
+    _STOP = object()
+    # Resource events that trigger a state read when watchResourceStates is not available
+    _EVENTS: dict[str, str] = {
+        'BeforeResourceStarted': 'on_before_resource_started',
+        'ResourceReady': 'on_resource_ready',
+        'ResourceStopped': 'on_resource_stopped',
+    }
+
+    def __init__(self, service: ResourceNotificationService, resources: typing.Iterable[AbstractResource], *, target_states: typing.Iterable[str] | None = None) -> None:
+        self._service = service
+        self._client = service._client
+        self._resources = list(resources)
+        self._resource_names: list[str] = self._client.invoke_capabilities(
+            ('Aspire.Hosting/getResourceName', {'resource': resource}) for resource in self._resources
+        )
+        self._target_states = set(target_states) if target_states is not None else None
+        self._updates: queue.Queue[typing.Any] = queue.Queue()
+        self._closed = threading.Event()
+        self._callback_id: str | None = None
+        self._subscription: typing.Any = None
+        self._handlers: list[tuple[AbstractResource, str, typing.Callable[[typing.Any], None]]] = []
+        self._last_seen: dict[str, tuple[typing.Any, ...]] = {}
+        self._subscribe()
+
+    def __repr__(self) -> str:
+        return f"ResourceStateWatch(resources={self._resource_names})"
+
+    def _subscribe(self) -> None:
+        callback_id = self._client.register_callback(self._updates.put)
+        rpc_args: dict[str, typing.Any] = {'notificationService': self._service.handle}
+        rpc_args['resourceNames'] = self._resource_names
+        if self._target_states is not None:
+            rpc_args['targetStates'] = sorted(self._target_states)
+        rpc_args['callback'] = callback_id
+        supported, self._subscription = self._client._invoke_if_supported('Aspire.Hosting/watchResourceStates', rpc_args)
+        if supported:
+            self._callback_id = callback_id
+            return
+        self._client.unregister_callback(callback_id)
+        for resource, name in zip(self._resources, self._resource_names):
+            for event_type, method in self._EVENTS.items():
+                # Only the name is queued; the state is read on the iterating thread, not the AppHost's
+                handler = lambda event, name=name: self._updates.put(name)
+                getattr(resource, method)(handler)
+                self._handlers.append((resource, event_type, handler))
+            self._updates.put(name)
+
+    def _read_state(self, resource_name: str) -> ResourceEventDto | None:
+        '''The resource's current state, or None if it is unknown, unchanged or filtered out.'''
+        snapshot = self._service.try_get_resource_state(resource_name)
+        if not snapshot:
+            return None
+        key = (snapshot.get("State"), snapshot.get("StateStyle"), snapshot.get("HealthStatus"), snapshot.get("ExitCode"))
+        if self._last_seen.get(resource_name) == key:
+            return None
+        self._last_seen[resource_name] = key
+        if self._target_states is not None and snapshot.get("State") not in self._target_states:
+            return None
+        return snapshot
+
+    def _next(self) -> ResourceEventDto | None:
+        '''Block for the next update. Returns None once the watch has ended.'''
+        while True:
+            if self._closed.is_set() and self._updates.empty():
+                return None
+            update = self._updates.get()
+            if update is self._STOP:
+                return None
+            if isinstance(update, str):
+                update = self._read_state(update)
+                if update is None:
+                    continue
+            return typing.cast(ResourceEventDto, update)
+
+    def __iter__(self) -> typing.Iterator[ResourceEventDto]:
+        return self
+
+    def __next__(self) -> ResourceEventDto:
+        update = self._next()
+        if update is None:
+            raise StopIteration
+        return update
+
+    def __aiter__(self) -> typing.AsyncIterator[ResourceEventDto]:
+        return self
+
+    async def __anext__(self) -> ResourceEventDto:
+        update = await asyncio.to_thread(self._next)
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+    def __enter__(self) -> ResourceStateWatch:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Ends the subscription and stops iteration once queued updates are drained."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._subscription is not None:
+            try:
+                self._client.invoke_capability(
+                    'Aspire.Hosting/unwatchResourceStates',
+                    {'subscription': self._subscription},
+                )
+            except Exception as e:
+                _logger.debug("Failed to end resource state watch: %s", e)
+            self._subscription = None
+        for resource, event_type, handler in self._handlers:
+            self._client.resource_events.unsubscribe(resource, event_type, handler)
+        self._handlers.clear()
+        self._client.unregister_callback(self._callback_id)
+        self._callback_id = None
+        self._updates.put(self._STOP)
+
 
 class ResourceReadyEvent:
     """Type class for ResourceReadyEvent."""
@@ -6214,7 +8090,12 @@ class _BaseResourceKwargs(typing.TypedDict, total=False):
     on_resource_ready: typing.Callable[[ResourceReadyEvent], None]
 
 class _BaseResource(AbstractResource):
-    """Base resource class."""
+    """Base resource class.
+
+    Fluent methods update this wrapper's handle, so a single resource should be configured
+    by one thread at a time. Different resources may be configured concurrently; see
+    `apply_parallel`.
+    """
 
     def _wrap_builder(self, builder: typing.Any) -> Handle:
         if isinstance(builder, Handle):
@@ -6501,7 +8382,7 @@ class _BaseResource(AbstractResource):
         """Adds a pipeline step to the resource that will be executed during deployment."""
         rpc_args: dict[str, typing.Any] = {'builder': self._handle}
         rpc_args['stepName'] = step_name
-        rpc_args['callback'] = self._client.register_callback(callback)
+        rpc_args['callback'] = self._client.register_callback(self._client.pipeline_timings.wrap(step_name, callback))
         if depends_on is not None:
             rpc_args['dependsOn'] = depends_on
         if required_by is not None:
@@ -6539,46 +8420,30 @@ class _BaseResource(AbstractResource):
 
     def on_before_resource_started(self, callback: typing.Callable[[BeforeResourceStartedEvent], None]) -> typing.Self:
         """Subscribes to the BeforeResourceStarted event."""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['callback'] = self._client.register_callback(callback)
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/onBeforeResourceStarted',
-            rpc_args,
-        )
-        self._handle = self._wrap_builder(result)
+        result = self._client.resource_events.subscribe(self, 'BeforeResourceStarted', callback)
+        if result is not None:
+            self._handle = self._wrap_builder(result)
         return self
 
     def on_resource_stopped(self, callback: typing.Callable[[ResourceStoppedEvent], None]) -> typing.Self:
         """Subscribes to the ResourceStopped event."""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['callback'] = self._client.register_callback(callback)
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/onResourceStopped',
-            rpc_args,
-        )
-        self._handle = self._wrap_builder(result)
+        result = self._client.resource_events.subscribe(self, 'ResourceStopped', callback)
+        if result is not None:
+            self._handle = self._wrap_builder(result)
         return self
 
     def on_initialize_resource(self, callback: typing.Callable[[InitializeResourceEvent], None]) -> typing.Self:
         """Subscribes to the InitializeResource event."""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['callback'] = self._client.register_callback(callback)
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/onInitializeResource',
-            rpc_args,
-        )
-        self._handle = self._wrap_builder(result)
+        result = self._client.resource_events.subscribe(self, 'InitializeResource', callback)
+        if result is not None:
+            self._handle = self._wrap_builder(result)
         return self
 
     def on_resource_ready(self, callback: typing.Callable[[ResourceReadyEvent], None]) -> typing.Self:
         """Subscribes to the ResourceReady event."""
-        rpc_args: dict[str, typing.Any] = {'builder': self._handle}
-        rpc_args['callback'] = self._client.register_callback(callback)
-        result = self._client.invoke_capability(
-            'Aspire.Hosting/onResourceReady',
-            rpc_args,
-        )
-        self._handle = self._wrap_builder(result)
+        result = self._client.resource_events.subscribe(self, 'ResourceReady', callback)
+        if result is not None:
+            self._handle = self._wrap_builder(result)
         return self
 
     def create_execution_config(self) -> AbstractExecutionConfigurationBuilder:
@@ -6817,30 +8682,26 @@ class _BaseResource(AbstractResource):
                 raise TypeError("Invalid type for option 'pipeline_config'. Expected: Callable[[PipelineConfigurationContext], None]")
         if _on_before_resource_started := kwargs.pop("on_before_resource_started", None):
             if _validate_type(_on_before_resource_started, typing.Callable[[BeforeResourceStartedEvent], None]):
-                rpc_args: dict[str, typing.Any] = {"builder": handle}
-                rpc_args["callback"] = client.register_callback(typing.cast(typing.Callable[[BeforeResourceStartedEvent], None], _on_before_resource_started))
-                handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/onBeforeResourceStarted', rpc_args))
+                result = client.resource_events.subscribe(self, 'BeforeResourceStarted', typing.cast(typing.Callable[[BeforeResourceStartedEvent], None], _on_before_resource_started), builder=handle)
+                handle = self._wrap_builder(result) if result is not None else handle
             else:
                 raise TypeError("Invalid type for option 'on_before_resource_started'. Expected: Callable[[BeforeResourceStartedEvent], None]")
         if _on_resource_stopped := kwargs.pop("on_resource_stopped", None):
             if _validate_type(_on_resource_stopped, typing.Callable[[ResourceStoppedEvent], None]):
-                rpc_args: dict[str, typing.Any] = {"builder": handle}
-                rpc_args["callback"] = client.register_callback(typing.cast(typing.Callable[[ResourceStoppedEvent], None], _on_resource_stopped))
-                handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/onResourceStopped', rpc_args))
+                result = client.resource_events.subscribe(self, 'ResourceStopped', typing.cast(typing.Callable[[ResourceStoppedEvent], None], _on_resource_stopped), builder=handle)
+                handle = self._wrap_builder(result) if result is not None else handle
             else:
                 raise TypeError("Invalid type for option 'on_resource_stopped'. Expected: Callable[[ResourceStoppedEvent], None]")
         if _on_initialize_resource := kwargs.pop("on_initialize_resource", None):
             if _validate_type(_on_initialize_resource, typing.Callable[[InitializeResourceEvent], None]):
-                rpc_args: dict[str, typing.Any] = {"builder": handle}
-                rpc_args["callback"] = client.register_callback(typing.cast(typing.Callable[[InitializeResourceEvent], None], _on_initialize_resource))
-                handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/onInitializeResource', rpc_args))
+                result = client.resource_events.subscribe(self, 'InitializeResource', typing.cast(typing.Callable[[InitializeResourceEvent], None], _on_initialize_resource), builder=handle)
+                handle = self._wrap_builder(result) if result is not None else handle
             else:
                 raise TypeError("Invalid type for option 'on_initialize_resource'. Expected: Callable[[InitializeResourceEvent], None]")
         if _on_resource_ready := kwargs.pop("on_resource_ready", None):
             if _validate_type(_on_resource_ready, typing.Callable[[ResourceReadyEvent], None]):
-                rpc_args: dict[str, typing.Any] = {"builder": handle}
-                rpc_args["callback"] = client.register_callback(typing.cast(typing.Callable[[ResourceReadyEvent], None], _on_resource_ready))
-                handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/onResourceReady', rpc_args))
+                result = client.resource_events.subscribe(self, 'ResourceReady', typing.cast(typing.Callable[[ResourceReadyEvent], None], _on_resource_ready), builder=handle)
+                handle = self._wrap_builder(result) if result is not None else handle
             else:
                 raise TypeError("Invalid type for option 'on_resource_ready'. Expected: Callable[[ResourceReadyEvent], None]")
         self._handle = handle
@@ -7123,7 +8984,7 @@ class ContainerResource(_BaseResource, AbstractResourceWithEnvironment, Abstract
         """Configures the resource to use a programmatically generated Dockerfile"""
         rpc_args: dict[str, typing.Any] = {'builder': self._handle}
         rpc_args['contextPath'] = context_path
-        rpc_args['callback'] = self._client.register_callback(callback)
+        rpc_args['callback'] = self._client.register_callback(_apply_dockerfile_builder(callback))
         if stage is not None:
             rpc_args['stage'] = stage
         result = self._client.invoke_capability(
@@ -7392,7 +9253,9 @@ class ContainerResource(_BaseResource, AbstractResourceWithEnvironment, Abstract
             'Aspire.Hosting/getEndpoint',
             rpc_args,
         )
-        return typing.cast(EndpointReference, result)
+        endpoint = typing.cast(EndpointReference, result)
+        endpoint._owner = self
+        return endpoint
 
     def as_http2_service(self) -> typing.Self:
         """Configures a resource to mark all endpoints' transport as HTTP/2. This is useful for HTTP/2 services that need prior knowledge."""
@@ -7760,12 +9623,12 @@ class ContainerResource(_BaseResource, AbstractResourceWithEnvironment, Abstract
             if _validate_tuple_types(_dockerfile_builder, (str, typing.Callable[[DockerfileBuilderCallbackContext], None])):
                 rpc_args: dict[str, typing.Any] = {"builder": handle}
                 rpc_args["contextPath"] = typing.cast(tuple[str, typing.Callable[[DockerfileBuilderCallbackContext], None]], _dockerfile_builder)[0]
-                rpc_args["callback"] = client.register_callback(typing.cast(tuple[str, typing.Callable[[DockerfileBuilderCallbackContext], None]], _dockerfile_builder)[1])
+                rpc_args["callback"] = client.register_callback(_apply_dockerfile_builder(typing.cast(tuple[str, typing.Callable[[DockerfileBuilderCallbackContext], None]], _dockerfile_builder)[1]))
                 handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/withDockerfileBuilder', rpc_args))
             elif _validate_dict_types(_dockerfile_builder, DockerfileBuilderParameters):
                 rpc_args: dict[str, typing.Any] = {"builder": handle}
                 rpc_args["contextPath"] = typing.cast(DockerfileBuilderParameters, _dockerfile_builder)["context_path"]
-                rpc_args["callback"] = client.register_callback(typing.cast(DockerfileBuilderParameters, _dockerfile_builder)["callback"])
+                rpc_args["callback"] = client.register_callback(_apply_dockerfile_builder(typing.cast(DockerfileBuilderParameters, _dockerfile_builder)["callback"]))
                 rpc_args["stage"] = typing.cast(DockerfileBuilderParameters, _dockerfile_builder).get("stage")
                 handle = self._wrap_builder(client.invoke_capability('Aspire.Hosting/withDockerfileBuilder', rpc_args))
             else:
@@ -8436,7 +10299,9 @@ class ProjectResource(_BaseResource, AbstractResourceWithEnvironment, AbstractRe
             'Aspire.Hosting/getEndpoint',
             rpc_args,
         )
-        return typing.cast(EndpointReference, result)
+        endpoint = typing.cast(EndpointReference, result)
+        endpoint._owner = self
+        return endpoint
 
     def as_http2_service(self) -> typing.Self:
         """Configures a resource to mark all endpoints' transport as HTTP/2. This is useful for HTTP/2 services that need prior knowledge."""
@@ -9338,7 +11203,9 @@ class ExecutableResource(_BaseResource, AbstractResourceWithEnvironment, Abstrac
             'Aspire.Hosting/getEndpoint',
             rpc_args,
         )
-        return typing.cast(EndpointReference, result)
+        endpoint = typing.cast(EndpointReference, result)
+        endpoint._owner = self
+        return endpoint
 
     def as_http2_service(self) -> typing.Self:
         """Configures a resource to mark all endpoints' transport as HTTP/2. This is useful for HTTP/2 services that need prior knowledge."""
@@ -10777,7 +12644,14 @@ class PostgresServerResource(ContainerResource, AbstractResourceWithConnectionSt
 # Connection Helper
 # ============================================================================
 
-def _get_client(*, debug: bool, heartbeat_interval: int | None) -> AspireClient:
+def _get_client(
+    *,
+    debug: bool,
+    heartbeat_interval: int | None,
+    profiler: _ApphostProfiler | None = None,
+    request_timeout: float | None = None,
+    tracer: _ApphostTracer | None = None,
+) -> AspireClient:
     '''
     Creates and connects to the Aspire AppHost.
     Reads connection info from environment variables set by `aspire run`.
@@ -10789,7 +12663,14 @@ def _get_client(*, debug: bool, heartbeat_interval: int | None) -> AspireClient:
             'Run this application using `aspire run`.'
         )
 
-    client = AspireClient(socket_path, debug=debug, heartbeat_interval=heartbeat_interval)
+    client = AspireClient(
+        socket_path,
+        debug=debug,
+        heartbeat_interval=heartbeat_interval,
+        profiler=profiler,
+        request_timeout=request_timeout,
+        tracer=tracer,
+    )
     client.connect()
     auth_token = os.environ.get('ASPIRE_REMOTE_APPHOST_TOKEN')
     if not auth_token:
@@ -10814,6 +12695,10 @@ def create_builder(
     options: CreateBuilderOptions | None = None,
     debug: bool | None = None,
     heartbeat_interval: int | None = None,
+    profile: bool | None = None,
+    profile_output: str | None = None,
+    request_timeout: float | None = None,
+    trace: bool | None = None,
  ) -> AbstractContextManager[DistributedApplicationBuilder]:
     '''
     Creates a new distributed application builder.
@@ -10838,12 +12723,28 @@ def create_builder(
             if the ASPIRE_DEBUG environment variable is set. Enabling or disabling here will override those defaults.
             Messages will be logged as INFO, with the 'aspire_app' logger name (connection heartbeat messages will be logged at DEBUG).
         heartbeat_interval (int): Optional interval in seconds for sending heartbeat messages to the AppHost. Default value is 5 seconds.
+        profile (bool): Whether to attribute the wall time of capability invocations and callbacks to the AppHost source lines that
+            caused them, and print a report sorted by total time on exit. Defaults to the ASPIRE_PROFILE environment variable.
+        profile_output (str): Optional path to write a Chrome trace (also readable by speedscope) of the profile. Defaults to the
+            ASPIRE_PROFILE_OUTPUT environment variable. Only used when profiling is enabled.
+        request_timeout (float): Optional number of seconds to wait for each AppHost response before raising TimeoutError.
+            Defaults to the ASPIRE_REQUEST_TIMEOUT environment variable, otherwise requests wait indefinitely.
+            Blocking calls such as running the application or waiting for a resource are not bounded by it.
+        trace (bool): Whether to emit OpenTelemetry spans for capability invocations and callbacks, and to send the trace context
+            to the AppHost. Requires the opentelemetry-api package; spans are exported over OTLP when OTEL_EXPORTER_OTLP_ENDPOINT
+            is set. Defaults to the ASPIRE_TRACE environment variable. When disabled, tracing costs nothing.
 
     Returns:
         A DistributedApplicationBuilder instance
     '''
     is_debug = debug if debug is not None else os.environ.get('ASPIRE_DEBUG', 'false').lower() == 'true'
-    client = _get_client(debug=is_debug, heartbeat_interval=heartbeat_interval)
+    is_profile = profile if profile is not None else os.environ.get('ASPIRE_PROFILE', 'false').lower() == 'true'
+    profiler = _ApphostProfiler(profile_output or os.environ.get('ASPIRE_PROFILE_OUTPUT')) if is_profile else None
+    if request_timeout is None and os.environ.get('ASPIRE_REQUEST_TIMEOUT'):
+        request_timeout = float(os.environ['ASPIRE_REQUEST_TIMEOUT'])
+    is_trace = trace if trace is not None else os.environ.get('ASPIRE_TRACE', 'false').lower() == 'true'
+    tracer = _ApphostTracer.create() if is_trace else None
+    client = _get_client(debug=is_debug, heartbeat_interval=heartbeat_interval, profiler=profiler, request_timeout=request_timeout, tracer=tracer)
 
     # Default args and project_directory if not provided
     effective_options = options or CreateBuilderOptions()
@@ -10918,7 +12819,6 @@ _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.Distrib
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.Docker.DockerfileBuilder", DockerfileBuilder)
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.DockerfileBuilderCallbackContext", DockerfileBuilderCallbackContext)
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.DockerfileFactoryContext", DockerfileFactoryContext)
-_register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.Docker.DockerfileStage", DockerfileStage)
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.EndpointReference", EndpointReference)
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.EndpointReferenceExpression", EndpointReferenceExpression)
 _register_handle_wrapper("Aspire.Hosting/Aspire.Hosting.ApplicationModel.EndpointUpdateContext", EndpointUpdateContext)
@@ -95,10 +95,16 @@ if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
 
     _flask_instrumentor = FlaskInstrumentor()
 
+import json
 import logging
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from flask import Flask, request, redirect, url_for, render_template_string
+from flask import Flask, request, redirect, url_for, render_template
+from jinja2 import DictLoader
+from markupsafe import Markup, escape
 import markdown
 import re
 
@@ -114,6 +120,68 @@ if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
 redis_client = None
 CACHE_TTL = 3600  # 1 hour
 
+# In-process cache tier in front of Redis, so hot pages are served without a network hop
+LOCAL_CACHE_SIZE = int(os.environ.get("WIKI_LOCAL_CACHE_SIZE", 256))
+INVALIDATION_CHANNEL = "wiki:invalidate"
+
+class LocalPageCache:
+    """Thread-safe, size-bounded LRU of rendered pages keyed by slug.
+
+    Each invalidation of a slug bumps its generation. A page rendered from a database
+    read that started before an invalidation is not stored, so a slow cache miss can't
+    put an old version back after an edit.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # slug -> rendered page
+        self._generations = {}  # slug -> number of invalidations
+        self._lock = threading.Lock()
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def get(self, slug):
+        with self._lock:
+            page = self._entries.get(slug)
+            if page is None:
+                return None
+            self._entries.move_to_end(slug)
+            self.stats["local_hits"] += 1
+            return page
+
+    def generation(self, slug):
+        with self._lock:
+            return self._generations.get(slug, 0)
+
+    def set(self, slug, page, generation):
+        """Store a page unless the slug was invalidated since `generation` was read."""
+        with self._lock:
+            if self._generations.get(slug, 0) != generation:
+                return False
+            self._entries[slug] = page
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, slug):
+        with self._lock:
+            self._entries.pop(slug, None)
+            self._generations[slug] = self._generations.get(slug, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, size=len(self._entries), maxsize=self.maxsize)
+
+local_cache = LocalPageCache(LOCAL_CACHE_SIZE)
+
 def _init_redis():
     """Initialize Redis client from Aspire connection info."""
     global redis_client
@@ -129,6 +197,7 @@ def _init_redis():
             )
             redis_client.ping()
             logger.info("Redis cache connected via CACHE_URI")
+            _start_invalidation_listener()
         except Exception as e:
             logger.warning("Redis unavailable, running without cache: %s", e)
             redis_client = None
@@ -153,51 +222,124 @@ def _init_redis():
             redis_client = _redis.Redis(**kwargs)
             redis_client.ping()
             logger.info("Redis cache connected via ConnectionStrings__cache")
+            _start_invalidation_listener()
         except Exception as e:
             logger.warning("Redis unavailable, running without cache: %s", e)
             redis_client = None
     else:
         logger.info("No Redis connection string found, running without cache")
 
-def _cache_key(slug):
-    return f"wiki:html:{slug}"
+def _start_invalidation_listener():
+    """Evict pages from the local cache when any replica invalidates them."""
+    def listen():
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    local_cache.invalidate(message["data"])
+            except Exception as e:
+                logger.warning("Cache invalidation listener failed, retrying: %s", e)
+                # Invalidations may have been missed while disconnected
+                local_cache.clear()
+                time.sleep(5)
+
+    threading.Thread(target=listen, name="cache-invalidation", daemon=True).start()
 
-def get_cached_html(slug):
-    """Retrieve cached rendered HTML for a page."""
-    if redis_client is None:
-        return None
-    try:
-        return redis_client.get(_cache_key(slug))
-    except Exception:
+def _cache_key(slug):
+    return f"wiki:page:{slug}"
+
+def get_cached_page(slug):
+    """Retrieve a rendered page (slug, title, updated_at, html), from memory first and then Redis."""
+    page = local_cache.get(slug)
+    if page is not None:
+        return page
+    generation = local_cache.generation(slug)
+    cached = None
+    if redis_client is not None:
+        try:
+            cached = redis_client.get(_cache_key(slug))
+        except Exception:
+            cached = None
+    if cached is None:
+        local_cache.count("misses")
         return None
-
-def set_cached_html(slug, html):
-    """Store rendered HTML in cache."""
+    local_cache.count("redis_hits")
+    page = json.loads(cached)
+    local_cache.set(slug, page, generation)
+    return page
+
+def set_cached_page(slug, page, generation):
+    """Store a rendered page in both cache tiers, unless it was invalidated while rendering."""
+    if not local_cache.set(slug, page, generation):
+        return
     if redis_client is None:
         return
     try:
-        redis_client.set(_cache_key(slug), html, ex=CACHE_TTL)
+        redis_client.set(_cache_key(slug), json.dumps(page), ex=CACHE_TTL)
     except Exception:
         pass
 
 def invalidate_cache(slug):
-    """Remove cached HTML when a page is edited."""
+    """Remove cached HTML when a page is edited, on this and every other replica."""
+    local_cache.invalidate(slug)
     if redis_client is None:
         return
     try:
-        redis_client.delete(_cache_key(slug))
+        pipe = redis_client.pipeline()
+        pipe.delete(_cache_key(slug))
+        pipe.publish(INVALIDATION_CHANNEL, slug)
+        pipe.execute()
     except Exception:
         pass
 
 # Database setup
 DB_PATH = "wiki.db"
 
-def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
+# Waitress serves requests from a fixed set of worker threads. Each thread keeps one
+# SQLite connection open for its lifetime, so the pool is exactly as large as the server.
+WAITRESS_THREADS = int(os.environ.get("WAITRESS_THREADS", 4))
+
+_db_local = threading.local()
+
+def _connect():
+    """Open a connection tuned for concurrent reads and writes."""
+    conn = sqlite3.connect(DB_PATH, timeout=5.0)
     conn.row_factory = sqlite3.Row
+    # WAL lets readers proceed while a writer commits; NORMAL sync is durable in WAL mode
+    # except for the last transactions on power loss, which is fine for a wiki
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+    conn.execute("PRAGMA cache_size = -16384")  # 16 MB
+    return conn
+
+def get_db():
+    """Get this thread's database connection, opening it on first use.
+
+    Connections are reused across requests; callers must not close them.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = _db_local.conn = _connect()
     return conn
 
+@app.teardown_appcontext
+def rollback_db(exception):
+    """Roll back a transaction a request left open, so the next request on this thread starts clean."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+# Markdown rendering. Pages are rendered when they are written and the HTML is stored
+# with the renderer version; change the version whenever the output would change.
+MARKDOWN_EXTENSIONS = ['extra', 'nl2br']
+RENDERER_VERSION = f"markdown-{markdown.__version__}:{','.join(MARKDOWN_EXTENSIONS)}"
+
+def render_markdown(content):
+    """Render page Markdown to HTML."""
+    return markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+
 def init_db():
     """Initialize database and seed with a Home page."""
     conn = get_db()
@@ -210,25 +352,132 @@ def init_db():
             slug TEXT UNIQUE NOT NULL,
             title TEXT NOT NULL,
             content TEXT NOT NULL,
+            html TEXT,
+            renderer_version TEXT,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
     
+    # Add the rendered HTML columns to databases created before render-on-write
+    columns = {row["name"] for row in cursor.execute("PRAGMA table_info(pages)")}
+    for column in ("html", "renderer_version"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
+    
+    # Full-text index over titles and content; its rowid is the page id
+    cursor.execute("SELECT COUNT(*) AS count FROM sqlite_master WHERE name = 'pages_fts'")
+    if cursor.fetchone()["count"] == 0:
+        cursor.execute("CREATE VIRTUAL TABLE pages_fts USING fts5(title, content, tokenize = 'porter unicode61')")
+        cursor.execute("INSERT INTO pages_fts (rowid, title, content) SELECT id, title, content FROM pages")
+    
     # Seed with a Home page if it doesn't exist
     cursor.execute("SELECT COUNT(*) as count FROM pages WHERE slug = ?", ("home",))
     if cursor.fetchone()["count"] == 0:
+        content = "# Welcome to the Markdown Wiki\n\nThis is your home page. Click **Edit** to modify it!\n\n## Features\n\n- Simple Markdown editing\n- SQLite backend\n- Orchestrated by Aspire\n- Create new pages\n- Edit existing pages"
         cursor.execute("""
-            INSERT INTO pages (slug, title, content, updated_at)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO pages (slug, title, content, html, renderer_version, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
             "home",
             "Home",
-            "# Welcome to the Markdown Wiki\n\nThis is your home page. Click **Edit** to modify it!\n\n## Features\n\n- Simple Markdown editing\n- SQLite backend\n- Orchestrated by Aspire\n- Create new pages\n- Edit existing pages",
+            content,
+            render_markdown(content),
+            RENDERER_VERSION,
             datetime.now()
         ))
+        cursor.execute("INSERT INTO pages_fts (rowid, title, content) VALUES (?, ?, ?)", (cursor.lastrowid, "Home", content))
     
     conn.commit()
-    conn.close()
+
+def rerender_pages(batch_size=100):
+    """Re-render pages stored with an older renderer version, in small transactions.
+
+    Pages are walked in id order, so each batch is an index range scan. A page edited
+    while it is being re-rendered keeps the edit, which was rendered when it was saved.
+    Returns the number of pages re-rendered.
+    """
+    conn = get_db()
+    last_id, rerendered = 0, 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, slug, content, updated_at FROM pages
+            WHERE id > ? AND renderer_version IS NOT ?
+            ORDER BY id LIMIT ?
+        """, (last_id, RENDERER_VERSION, batch_size)).fetchall()
+        if not rows:
+            return rerendered
+        updated = []
+        for row in rows:
+            cursor = conn.execute("""
+                UPDATE pages SET html = ?, renderer_version = ?
+                WHERE id = ? AND updated_at IS ?
+            """, (render_markdown(row["content"]), RENDERER_VERSION, row["id"], row["updated_at"]))
+            if cursor.rowcount:
+                updated.append(row["slug"])
+        conn.commit()
+        for slug in updated:
+            invalidate_cache(slug)
+        rerendered += len(updated)
+        last_id = rows[-1]["id"]
+
+@app.cli.command("rerender")
+def rerender_command():
+    """Re-render every page stored with an older renderer version."""
+    init_db()
+    _init_redis()
+    count = rerender_pages()
+    print(f"Re-rendered {count} page(s) with {RENDERER_VERSION}")
+
+SEARCH_PAGE_SIZE = 20
+
+# Unlikely control characters that stand in for <mark> tags until the snippet is escaped
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are never parsed.
+    Short last words match exactly, since a one or two letter prefix expands to a large
+    share of the vocabulary and would merge most of the index.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    query = " ".join(f'"{word}"' for word in words)
+    return query + "*" if len(words[-1]) >= 3 else query
+
+def search_pages(text, page=1):
+    """Rank pages matching `text`, best first, with a highlighted content snippet.
+
+    Returns one page of results and whether there is a next page. Matching, ranking
+    and snippets all come from the FTS5 index, so the pages table is only read for
+    the rows that are returned.
+    """
+    query = fts_query(text)
+    if query is None:
+        return [], False
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT pages.slug, pages.title, pages.updated_at,
+               snippet(pages_fts, 1, ?, ?, '…', 24) AS snippet
+        FROM pages_fts JOIN pages ON pages.id = pages_fts.rowid
+        WHERE pages_fts MATCH ? AND rank MATCH 'bm25(10.0, 1.0)'
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    """, (_MARK_START, _MARK_END, query, SEARCH_PAGE_SIZE + 1, (page - 1) * SEARCH_PAGE_SIZE))
+    rows = cursor.fetchall()
+    results = [
+        {
+            "slug": row["slug"],
+            "title": row["title"],
+            "updated_at": row["updated_at"],
+            # Page content is user input: escape it, then turn the markers into tags
+            "snippet": Markup(str(escape(row["snippet"])).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")),
+        }
+        for row in rows[:SEARCH_PAGE_SIZE]
+    ]
+    return results, len(rows) > SEARCH_PAGE_SIZE
 
 def slugify(text):
     """Convert text to URL-safe slug."""
@@ -277,6 +526,22 @@ BASE_TEMPLATE = """
         nav a:hover {
             text-decoration: underline;
         }
+        nav form {
+            display: inline;
+            float: right;
+        }
+        nav input[type="search"] {
+            padding: 4px 8px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }
+        .snippet {
+            color: #444;
+            margin-top: 5px;
+        }
+        mark {
+            background-color: #fff3b0;
+        }
         .page-list {
             list-style: none;
             padding: 0;
@@ -363,6 +628,9 @@ BASE_TEMPLATE = """
         <nav>
             <a href="/">Home</a>
             <a href="/new">New Page</a>
+            <form action="/search" method="GET">
+                <input type="search" name="q" value="{{ q }}" placeholder="Search pages">
+            </form>
         </nav>
         {% block content %}{% endblock %}
     </div>
@@ -370,7 +638,7 @@ BASE_TEMPLATE = """
 </html>
 """
 
-INDEX_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
+INDEX_TEMPLATE = """{% extends "base.html" %}{% block content %}
         <h1>All Wiki Pages</h1>
         <ul class="page-list">
         {% for page in pages %}
@@ -380,9 +648,9 @@ INDEX_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
             </li>
         {% endfor %}
         </ul>
-""")
+{% endblock %}"""
 
-PAGE_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
+PAGE_TEMPLATE = """{% extends "base.html" %}{% block content %}
         <h1>{{ page.title }}</h1>
         <div class="actions">
             <a href="/page/{{ page.slug }}/edit">Edit</a>
@@ -392,9 +660,9 @@ PAGE_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
             {{ content|safe }}
         </div>
         <div class="timestamp">Last updated: {{ page.updated_at }}</div>
-""")
+{% endblock %}"""
 
-EDIT_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
+EDIT_TEMPLATE = """{% extends "base.html" %}{% block content %}
         <h1>Edit: {{ page.title }}</h1>
         <form method="POST" action="/page/{{ page.slug }}">
             <div class="form-group">
@@ -404,9 +672,9 @@ EDIT_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
             <button type="submit" class="btn">Save</button>
             <a href="/page/{{ page.slug }}" class="btn btn-secondary">Cancel</a>
         </form>
-""")
+{% endblock %}"""
 
-NEW_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
+NEW_TEMPLATE = """{% extends "base.html" %}{% block content %}
         <h1>Create New Page</h1>
         <form method="POST" action="/new">
             <div class="form-group">
@@ -420,7 +688,37 @@ NEW_TEMPLATE = BASE_TEMPLATE.replace("{% block content %}{% endblock %}", """
             <button type="submit" class="btn">Create Page</button>
             <a href="/" class="btn btn-secondary">Cancel</a>
         </form>
-""")
+{% endblock %}"""
+
+SEARCH_TEMPLATE = """{% extends "base.html" %}{% block content %}
+        <h1>Search: {{ q }}</h1>
+        {% if results %}
+        <ul class="page-list">
+        {% for result in results %}
+            <li>
+                <a href="/page/{{ result.slug }}">{{ result.title }}</a>
+                <div class="snippet">{{ result.snippet }}</div>
+            </li>
+        {% endfor %}
+        </ul>
+        {% else %}
+        <p>No pages match your search.</p>
+        {% endif %}
+        <div class="actions">
+            {% if page > 1 %}<a href="{{ url_for('search', q=q, page=page - 1) }}">Previous</a>{% endif %}
+            {% if has_next %}<a href="{{ url_for('search', q=q, page=page + 1) }}">Next</a>{% endif %}
+        </div>
+{% endblock %}"""
+
+# Templates are compiled once by the loader and cached, rather than on every request
+app.jinja_loader = DictLoader({
+    "base.html": BASE_TEMPLATE,
+    "index.html": INDEX_TEMPLATE,
+    "page.html": PAGE_TEMPLATE,
+    "edit.html": EDIT_TEMPLATE,
+    "new.html": NEW_TEMPLATE,
+    "search.html": SEARCH_TEMPLATE,
+})
 
 # Routes
 @app.route("/")
@@ -430,28 +728,38 @@ def index():
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM pages ORDER BY updated_at DESC")
     pages = cursor.fetchall()
-    conn.close()
-    return render_template_string(INDEX_TEMPLATE, title="All Pages", pages=pages)
+    return render_template("index.html", title="All Pages", pages=pages)
 
 @app.route("/page/<slug>")
 def view_page(slug):
     """View a wiki page with rendered Markdown."""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM pages WHERE slug = ?", (slug,))
-    page = cursor.fetchone()
-    conn.close()
-    
-    if not page:
-        return f"Page not found: {slug}", 404
-    
-    # Check cache first, then render and store
-    html_content = get_cached_html(slug)
-    if html_content is None:
-        html_content = markdown.markdown(page["content"], extensions=['extra', 'nl2br'])
-        set_cached_html(slug, html_content)
+    # Cache hits hold the whole rendered page and never touch SQLite
+    page = get_cached_page(slug)
+    if page is None:
+        generation = local_cache.generation(slug)
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute("SELECT title, html, renderer_version, updated_at FROM pages WHERE slug = ?", (slug,))
+        row = cursor.fetchone()
+        
+        if not row:
+            return f"Page not found: {slug}", 404
+        
+        html = row["html"]
+        if row["renderer_version"] != RENDERER_VERSION:
+            # Not yet re-rendered since the renderer changed; the background re-render stores it
+            cursor.execute("SELECT content FROM pages WHERE slug = ?", (slug,))
+            html = render_markdown(cursor.fetchone()["content"])
+        
+        page = {
+            "slug": slug,
+            "title": row["title"],
+            "updated_at": row["updated_at"],
+            "html": html,
+        }
+        set_cached_page(slug, page, generation)
     
-    return render_template_string(PAGE_TEMPLATE, title=page["title"], page=page, content=html_content)
+    return render_template("page.html", title=page["title"], page=page, content=page["html"])
 
 @app.route("/page/<slug>/edit")
 def edit_page(slug):
@@ -460,27 +768,30 @@ def edit_page(slug):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM pages WHERE slug = ?", (slug,))
     page = cursor.fetchone()
-    conn.close()
     
     if not page:
         return f"Page not found: {slug}", 404
     
-    return render_template_string(EDIT_TEMPLATE, title=f"Edit {page['title']}", page=page)
+    return render_template("edit.html", title=f"Edit {page['title']}", page=page)
 
 @app.route("/page/<slug>", methods=["POST"])
 def save_page(slug):
     """Save updated Markdown content."""
     content = request.form.get("content", "")
+    html = render_markdown(content)
     
     conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE pages
-        SET content = ?, updated_at = ?
-        WHERE slug = ?
-    """, (content, datetime.now(), slug))
-    conn.commit()
-    conn.close()
+    # Both tables are updated in one transaction, which is rolled back if either fails
+    with conn:
+        conn.execute("""
+            UPDATE pages
+            SET content = ?, html = ?, renderer_version = ?, updated_at = ?
+            WHERE slug = ?
+        """, (content, html, RENDERER_VERSION, datetime.now(), slug))
+        conn.execute("""
+            UPDATE pages_fts SET content = ?
+            WHERE rowid = (SELECT id FROM pages WHERE slug = ?)
+        """, (content, slug))
     
     invalidate_cache(slug)
     
@@ -489,7 +800,7 @@ def save_page(slug):
 @app.route("/new")
 def new_page():
     """Show form to create a new page."""
-    return render_template_string(NEW_TEMPLATE, title="New Page")
+    return render_template("new.html", title="New Page")
 
 @app.route("/new", methods=["POST"])
 def create_page():
@@ -505,26 +816,33 @@ def create_page():
     if not slug:
         return "Invalid title", 400
     
+    html = render_markdown(content)
     conn = get_db()
-    cursor = conn.cursor()
     
     try:
-        cursor.execute("""
-            INSERT INTO pages (slug, title, content, updated_at)
-            VALUES (?, ?, ?, ?)
-        """, (slug, title, content, datetime.now()))
-        conn.commit()
+        with conn:
+            cursor = conn.execute("""
+                INSERT INTO pages (slug, title, content, html, renderer_version, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (slug, title, content, html, RENDERER_VERSION, datetime.now()))
+            conn.execute("INSERT INTO pages_fts (rowid, title, content) VALUES (?, ?, ?)", (cursor.lastrowid, title, content))
     except sqlite3.IntegrityError:
-        conn.close()
         return f"A page with slug '{slug}' already exists", 400
     
-    conn.close()
     return redirect(url_for("view_page", slug=slug))
 
+@app.route("/search")
+def search():
+    """Full-text search over page titles and content."""
+    q = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    results, has_next = search_pages(q, page)
+    return render_template("search.html", title=f"Search: {q}", q=q, results=results, page=page, has_next=has_next)
+
 @app.route("/health")
 def health():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "markdown-wiki"}, 200
+    return {"status": "healthy", "service": "markdown-wiki", "cache": local_cache.snapshot()}, 200
 
 if __name__ == "__main__":
     # Initialize database
@@ -533,14 +851,17 @@ if __name__ == "__main__":
     # Initialize Redis cache (optional — works without it)
     _init_redis()
     
+    # Bring pages rendered by an older renderer up to date without delaying startup
+    threading.Thread(target=rerender_pages, name="rerender", daemon=True).start()
+    
     # Get port from environment variable
     port = int(os.environ.get("PORT", 8080))
     
     # Use waitress in production, Flask dev server as fallback
     try:
         from waitress import serve
-        logger.info("Starting wiki server on port %d with Waitress...", port)
-        serve(app, host="0.0.0.0", port=port)
+        logger.info("Starting wiki server on port %d with Waitress (%d threads)...", port, WAITRESS_THREADS)
+        serve(app, host="0.0.0.0", port=port, threads=WAITRESS_THREADS)
     except ImportError:
         logger.info("Waitress not found, using Flask dev server on port %d...", port)
         app.run(host="0.0.0.0", port=port, debug=True)